@@ -0,0 +1,110 @@
+"""
+Benchmark the updaters on synthetic inputs at 1x, 10x and 100x scale
+
+Times results_updater parsing (workbook load + parse_matches),
+extract_player_data_from_excel and extract_table.parse_league_table.
+Every case runs in its own interpreter so peak RSS is per case. The
+extract_table rows are the table rows actually parsed: parse_league_table
+stops after the league rows, however large the exported sheet is.
+
+Usage: python benchmark_updaters.py [--scales 1 10 100] [--json bench.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_data import write_workbook, write_league_html
+
+# 1x is roughly one season
+BASE_MATCHES = 30
+BASE_PLAYERS = 22
+BASE_TEAMS = 12
+CASES = ['results_updater', 'player_updater', 'extract_table']
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+def run_case(case, path):
+    """
+    Time one case in this process (imports excluded); returns (seconds, rows
+    parsed), rows being None when the case does not report them
+    """
+    count = lambda result: None
+    # heavy imports happen here, outside the timing
+    if case == 'results_updater':
+        import pandas
+        from workbook_loader import load_sheets, MATCH_SHEET
+        from results_updater import parse_matches
+        work = lambda: parse_matches(load_sheets(path)[MATCH_SHEET])
+    elif case == 'player_updater':
+        import pandas
+        from player_updater import extract_player_data_from_excel
+        work = lambda: extract_player_data_from_excel(path)
+    elif case == 'extract_table':
+        from extract_table import parse_league_table
+        work = lambda: parse_league_table(path)
+        count = len
+    else:
+        raise ValueError(f"unknown case: {case}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = work()
+        return time.perf_counter() - start, count(result)
+
+def measure(case, path):
+    """Run a case in a fresh interpreter: (seconds, rows parsed or None, peak RSS in MB)"""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', case, path],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    return data['seconds'], data['rows'], data['peak_rss_mb']
+
+def run_benchmarks(scales, work_dir):
+    results = []
+    print(f"{'case':<16} {'scale':>5} {'rows':>8} {'seconds':>9} {'rows/s':>11} {'peak RSS':>10}")
+    for scale in scales:
+        workbook = os.path.join(work_dir, f"synthetic_{scale}x.xlsx")
+        html = os.path.join(work_dir, f"synthetic_{scale}x.htm")
+        workbook_rows = write_workbook(workbook, BASE_MATCHES * scale, BASE_PLAYERS)
+        html_rows = write_league_html(html, BASE_TEAMS * scale)
+
+        for case in CASES:
+            path, rows = (html, html_rows) if case == 'extract_table' else (workbook, workbook_rows)
+            seconds, parsed, rss = measure(case, path)
+            if parsed is not None:
+                rows = parsed
+            results.append({'case': case, 'scale': scale, 'rows': rows, 'seconds': seconds,
+                            'rows_per_second': rows / seconds if seconds else None, 'peak_rss_mb': rss})
+            print(f"{case:<16} {scale:>4}x {rows:>8} {seconds:>9.3f} {rows / seconds:>11,.0f} {rss:>7.1f} MB")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the updaters on synthetic inputs")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--json', help="also write the results to this file")
+    parser.add_argument('--worker', nargs=2, metavar=('CASE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        seconds, rows = run_case(*args.worker)
+        print(json.dumps({'seconds': seconds, 'rows': rows, 'peak_rss_mb': peak_rss_mb()}))
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = run_benchmarks(args.scales, work_dir)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
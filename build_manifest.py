@@ -0,0 +1,123 @@
+"""
+Track the inputs and outputs of each updater so unchanged runs can be skipped
+
+The manifest records size, mtime and content hash of every input (the source
+files and the updater code itself) and the hash of every generated output.
+Optional inputs (seasons.json, ...) that do not exist are recorded as
+missing, and creating one later makes the step stale.
+Only the standard library is imported here, so checking it stays cheap.
+"""
+
+import json
+import os
+
+import json_writer
+from workbook_loader import EXCEL_PATH
+
+MANIFEST_PATH = ".update_manifest.json"
+
+STEPS = {
+    'league_table': {
+        'inputs': ['sheet.htm', 'extract_table.py'],
+        'outputs': ['league_data.json']
+    },
+    'players': {
+        'inputs': [EXCEL_PATH, 'player_updater.py', 'name_index.py', 'player_aliases.json',
+                   'results_updater.py', 'workbook_loader.py'],
+        'outputs': ['players.json']
+    },
+    'matches': {
+        'inputs': [EXCEL_PATH, 'results_updater.py', 'workbook_loader.py', 'seasons.json', 'partitions.py'],
+        'outputs': ['matches.json', 'matches/index.json']
+    },
+    'images': {
+        'inputs': ['players.json', 'player_photos.json', 'image_assets.py',
+                   'logo_mg-1.png', 'logo_mg.jpeg', 'club_placeholder.png'],
+        # every file in these directories is an input too (listed at check time)
+        'input_dirs': ['player_info'],
+        'outputs': ['assets/images.json']
+    },
+    # runs last: bundles the outputs of the steps above
+    'site_data': {
+        'inputs': ['players.json', 'matches.json', 'league_data.json', 'bundle.py', 'seasons.json'],
+        'outputs': ['site_data.json']
+    }
+}
+
+def file_hash(path):
+    """SHA-256 of a file's contents"""
+    import hashlib
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def file_state(path):
+    """Recorded state of a file; None for an optional input that does not exist"""
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_hash(path)}
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    json_writer.write_json(path, manifest)
+
+def _unchanged(path, recorded):
+    """Compare a file with its recorded state; size+mtime first, hash only if they moved"""
+    if recorded is None:
+        return not os.path.exists(path)  # still missing
+    if not os.path.exists(path):
+        return False
+    stat = os.stat(path)
+    if stat.st_size != recorded['size']:
+        return False
+    if stat.st_mtime_ns == recorded['mtime_ns']:
+        return True
+    return file_hash(path) == recorded['sha256']
+
+def is_up_to_date(step, inputs, outputs, manifest_path=MANIFEST_PATH):
+    """True when every input and output matches what was recorded for `step`"""
+    entry = load_manifest(manifest_path).get(step)
+    if not entry:
+        return False
+    recorded_inputs = entry.get('inputs', {})
+    recorded_outputs = entry.get('outputs', {})
+    if set(recorded_inputs) != set(inputs) or set(recorded_outputs) != set(outputs):
+        return False
+    return (all(_unchanged(p, recorded_inputs[p]) for p in inputs) and
+            all(_unchanged(p, recorded_outputs[p]) for p in outputs))
+
+def record_step(step, inputs, outputs, manifest_path=MANIFEST_PATH):
+    """Store the current state of a step's inputs and outputs after a successful run"""
+    manifest = load_manifest(manifest_path)
+    manifest[step] = {
+        'inputs': {p: file_state(p) for p in inputs},
+        'outputs': {p: file_state(p) for p in outputs if os.path.exists(p)}
+    }
+    save_manifest(manifest, manifest_path)
+
+def step_inputs(name):
+    """Inputs of one of the named STEPS, including the current files of its input_dirs"""
+    spec = STEPS[name]
+    inputs = list(spec['inputs'])
+    for directory in spec.get('input_dirs', []):
+        if os.path.isdir(directory):
+            inputs += sorted(os.path.join(directory, entry.name) for entry in os.scandir(directory) if entry.is_file())
+    return inputs
+
+def step_is_current(name, manifest_path=MANIFEST_PATH):
+    """is_up_to_date for one of the named STEPS"""
+    return is_up_to_date(name, step_inputs(name), STEPS[name]['outputs'], manifest_path)
+
+def record_named_step(name, manifest_path=MANIFEST_PATH):
+    record_step(name, step_inputs(name), STEPS[name]['outputs'], manifest_path)
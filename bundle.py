@@ -0,0 +1,99 @@
+"""
+Bundle players.json, matches.json and league_data.json into site_data.json
+
+Usage: python bundle.py [-o site_data.json] [--recent 3] [-v | -q]
+
+Runs after the three updaters. The homepage renders everything from this one
+file (see loadSiteData in data_fetch.js), so its sections are already in the
+shape the page shows: top performers with their full stat lines, the season
+summary, the last N results newest first and the standings with our row
+picked out, plus the derived stats block of matches.json (form, home/away
+splits, POM per opponent). `version` changes whenever the layout of the
+bundle does.
+"""
+
+import argparse
+import json
+from datetime import datetime
+
+from instrumentation import stage, get_logger, configure_logging, add_logging_arguments, write_profile
+import json_writer
+from partitions import configured_team
+
+BUNDLE_JSON = 'site_data.json'
+BUNDLE_VERSION = 2
+RECENT_RESULTS = 3
+SOURCES = {'players': 'players.json', 'matches': 'matches.json', 'league': 'league_data.json'}
+
+log = get_logger('bundle')
+
+def performer_line(players, name):
+    stats = players.get(name, {})
+    return {
+        'name': name,
+        'apps': stats.get('apps', 0),
+        'goals': stats.get('goals', 0),
+        'assists': stats.get('assists', 0)
+    }
+
+def recent_results(matches, count=RECENT_RESULTS):
+    """The last `count` matches, newest first"""
+    latest = sorted(matches, key=lambda m: m['date'], reverse=True)[:count]
+    return [{key: match.get(key) for key in ('date', 'opponent', 'location', 'result', 'outcome')}
+            for match in latest]
+
+def build_site_data(players_doc, matches_doc, league_doc, recent=RECENT_RESULTS, team=None):
+    players = players_doc.get('players', {})
+    top = players_doc.get('top_performers', {})
+    teams = league_doc.get('teams', [])
+    our_team = next((row for row in teams if team and team in row['team']), None)
+    return {
+        'version': BUNDLE_VERSION,
+        'generated': datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+        'season': matches_doc.get('metadata', {}).get('season'),
+        'summary': matches_doc.get('summary', {}),
+        'derived': matches_doc.get('derived', {}),
+        'squad': {
+            'players': len(players),
+            'matches_played': players_doc.get('derived', {}).get('max_apps', 0)
+        },
+        'top_performers': {
+            role: performer_line(players, entry['name']) for role, entry in top.items()
+        },
+        'recent_results': recent_results(matches_doc.get('matches', []), recent),
+        'standings': {
+            'last_updated': league_doc.get('last_updated'),
+            'teams': teams,
+            'our_team': our_team
+        }
+    }
+
+def write_site_data(output_path=BUNDLE_JSON, recent=RECENT_RESULTS, sources=None, team=None):
+    """
+    Read the updater outputs and write the bundle; returns it. `sources`
+    overrides the SOURCES paths (a partition may have no 'league'), `team`
+    defaults to the first team in seasons.json.
+    """
+    sources = sources or SOURCES
+    documents = {}
+    for key, path in sources.items():
+        with open(path, encoding='utf-8') as f:
+            documents[key] = json.load(f)
+    with stage('aggregation'):
+        data = build_site_data(documents['players'], documents['matches'], documents.get('league', {}), recent,
+                               team or configured_team())
+    json_writer.write_json(output_path, data)
+    log.info("📦 Bundled %s into %s", ', '.join(sources.values()), output_path)
+    return data
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge the updater outputs into one site_data.json for the homepage")
+    parser.add_argument('-o', '--output', default=BUNDLE_JSON)
+    parser.add_argument('--recent', type=int, default=RECENT_RESULTS, help="number of latest results to include")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(args.verbose, args.quiet)
+
+    write_site_data(args.output, args.recent)
+    if args.profile:
+        write_profile(args.profile, command='bundle')
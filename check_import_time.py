@@ -0,0 +1,66 @@
+"""
+Startup-time check for the updaters, based on python -X importtime
+
+Imports each updater module in a fresh interpreter and fails (exit code 1) if
+its cumulative import time exceeds the budget, or if it pulls in one of the
+heavy libraries that must only load on the parsing path.
+
+Usage: python check_import_time.py [--budget-ms 50] [--runs 3]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+MODULES = ['extract_table', 'player_updater', 'results_updater', 'update_all']
+HEAVY_MODULES = {'pandas', 'numpy', 'openpyxl', 'bs4', 'lxml'}
+DEFAULT_BUDGET_MS = 50.0
+
+def measure_import(module, cwd=None):
+    """
+    Return (cumulative import time in ms, set of top-level packages imported)
+    for `import module` in a new interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd, capture_output=True, text=True, check=True
+    )
+    total_us = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        imported.add(name.split('.')[0])
+        if name == module:
+            total_us = int(cumulative)
+    return total_us / 1000.0, imported
+
+def check_import_time(budget_ms=DEFAULT_BUDGET_MS, runs=3, cwd=None):
+    """Print one line per module; returns True when every module is within budget"""
+    ok = True
+    for module in MODULES:
+        # best of several runs, to keep disk-cache noise out of the number
+        timings = [measure_import(module, cwd) for _ in range(runs)]
+        best_ms = min(ms for ms, _ in timings)
+        heavy = sorted(HEAVY_MODULES & timings[0][1])
+
+        status = 'ok'
+        if heavy:
+            status = f"FAIL (imports {', '.join(heavy)})"
+            ok = False
+        elif best_ms > budget_ms:
+            status = f"FAIL (budget {budget_ms:.0f} ms)"
+            ok = False
+        print(f"{module:<18} {best_ms:8.1f} ms  {status}")
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail when updater import time regresses past a budget")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, help="per-module cumulative import budget")
+    parser.add_argument('--runs', type=int, default=3, help="runs per module (best one counts)")
+    args = parser.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.exit(0 if check_import_time(args.budget_ms, args.runs, cwd=here) else 1)
@@ -0,0 +1,172 @@
+// data_fetch.js
+// Fetch site JSON through the publish manifest (data/manifest.json, written by
+// publish.py) when there is one, otherwise fall back to the plain file.
+// With ?season=2024-2025[&team=first-team] in the page URL the files of that
+// partition are loaded instead (seasons/index.json, written by partitions.py).
+
+const DATA_DIR = 'data';
+let manifestPromise = null;
+let partitionPromise = null;
+
+// Directory of the partition selected in the URL, or null for the default files
+function loadPartitionPath() {
+    if (!partitionPromise) {
+        const params = new URLSearchParams(window.location.search);
+        const season = params.get('season');
+        partitionPromise = !season ? Promise.resolve(null) : fetch('seasons/index.json')
+            .then(response => response.ok ? response.json() : null)
+            .then(index => {
+                const entries = index && index.seasons[season];
+                if (!entries) return null;
+                const entry = entries.find(e => e.id === params.get('team')) || entries[0];
+                return entry.path;
+            })
+            .catch(() => null);
+    }
+    return partitionPromise;
+}
+
+function loadManifest() {
+    if (!manifestPromise) {
+        manifestPromise = fetch(`${DATA_DIR}/manifest.json`, { cache: 'no-cache' })
+            .then(response => response.ok ? response.json() : {})
+            .catch(() => ({}));
+    }
+    return manifestPromise;
+}
+
+// Turn column-wise player lists ({name: [...], goals: [...]}) back into rows
+function decodeColumnarPlayers(data) {
+    if (!data.encoding || data.encoding.players !== 'columnar') {
+        return data;
+    }
+    data.matches.forEach(match => {
+        const columns = match.players;
+        const keys = Object.keys(columns);
+        const count = keys.length ? columns[keys[0]].length : 0;
+        match.players = Array.from({ length: count }, (_, i) => {
+            const player = {};
+            keys.forEach(key => { player[key] = columns[key][i]; });
+            return player;
+        });
+    });
+    delete data.encoding;
+    return data;
+}
+
+// Returns a fetch Response-like object so callers keep their ok/json() checks
+async function fetchData(name) {
+    const partition = await loadPartitionPath();
+    const manifest = partition ? {} : await loadManifest();
+    const entry = manifest[name];
+    const response = await fetch(partition ? `${partition}/${name}` : entry ? `${DATA_DIR}/${entry.file}` : name);
+    return {
+        ok: response.ok,
+        status: response.status,
+        json: async () => decodeColumnarPlayers(await response.json())
+    };
+}
+
+// The homepage bundle (site_data.json, written by bundle.py), fetched once and
+// shared by data_loader.js and table_updater.js; null when it is missing.
+// Fetched directly rather than through the publish manifest, so the homepage
+// data is a single request
+let siteDataPromise = null;
+
+function loadSiteData() {
+    if (!siteDataPromise) {
+        siteDataPromise = loadPartitionPath()
+            .then(partition => fetch(partition ? `${partition}/site_data.json` : 'site_data.json'))
+            .then(response => response.ok ? response.json() : null)
+            .catch(() => null);
+    }
+    return siteDataPromise;
+}
+
+// Thumbnail map written by image_assets.py (assets/images.json); null when missing
+let imageMapPromise = null;
+
+function loadImageMap() {
+    if (!imageMapPromise) {
+        imageMapPromise = fetch('assets/images.json')
+            .then(response => response.ok ? response.json() : null)
+            .catch(() => null);
+    }
+    return imageMapPromise;
+}
+
+// {src, srcset, sizes} of an images.json entry shown `displayWidth` CSS pixels
+// wide: WebP srcset, JPEG src of the smallest thumbnail that is wide enough
+function thumbnailSources(entry, displayWidth) {
+    if (!entry.thumbnails.length) {
+        return { src: entry.source, srcset: '', sizes: '' };
+    }
+    const fallback = entry.thumbnails.find(thumb => thumb.width >= displayWidth) ||
+                     entry.thumbnails[entry.thumbnails.length - 1];
+    return {
+        src: fallback.jpeg,
+        srcset: entry.thumbnails.map(thumb => `${thumb.webp} ${thumb.width}w`).join(', '),
+        sizes: `${displayWidth}px`
+    };
+}
+
+// A player's own entry, or the shared placeholder logo entry for players
+// without a photo (when `withPlaceholder`); null when there is neither
+function playerImageEntry(imageMap, playerName, withPlaceholder) {
+    const entry = imageMap && imageMap.players[playerName];
+    if (!entry) return null;
+    if (entry.photo) return entry;
+    return withPlaceholder ? imageMap.logos[entry.logo] || null : null;
+}
+
+// thumbnailSources as <img> attributes, for markup built as a string; without
+// a map `fallback` (the original file) is used
+function imageAttributes(entry, displayWidth, fallback) {
+    const sources = entry ? thumbnailSources(entry, displayWidth) : { src: fallback, srcset: '', sizes: '' };
+    return `src="${sources.src}" srcset="${sources.srcset}" sizes="${sources.sizes}"`;
+}
+
+function logoAttributes(imageMap, logo, displayWidth) {
+    return imageAttributes(imageMap && imageMap.logos[logo], displayWidth, logo);
+}
+
+// A player's photo, or the club placeholder when there is none
+function playerPhotoAttributes(imageMap, playerName, displayWidth) {
+    return imageAttributes(playerImageEntry(imageMap, playerName, true), displayWidth, 'club_placeholder.png');
+}
+
+function setThumbnail(img, entry, displayWidth) {
+    const sources = thumbnailSources(entry, displayWidth);
+    img.srcset = sources.srcset;
+    img.sizes = sources.sizes;
+    img.src = sources.src;
+}
+
+// Point an <img> at a player's own photo thumbnails; leaves it alone when the
+// player has no photo or there is no map
+async function applyPlayerPhoto(img, playerName, displayWidth) {
+    const entry = playerImageEntry(await loadImageMap(), playerName, false);
+    if (entry) setThumbnail(img, entry, displayWidth);
+}
+
+// Upgrade the static <img src="assets/<stem>-<width>.jpg" data-logo="logo_mg-1.png"
+// data-width="120"> and <img ... data-player="roster name" data-fallback="photo">
+// tags of the page with the WebP srcset from the thumbnail map. The static src
+// already shows before the map loads; without a map (no thumbnails were
+// built) it is swapped for the original file
+async function applyImageTags() {
+    const imageMap = await loadImageMap();
+    document.querySelectorAll('img[data-logo], img[data-player]').forEach(img => {
+        const entry = img.dataset.logo ? imageMap && imageMap.logos[img.dataset.logo]
+                                       : playerImageEntry(imageMap, img.dataset.player, false);
+        if (entry && entry.thumbnails.length) {
+            const sources = thumbnailSources(entry, Number(img.dataset.width));
+            img.sizes = sources.sizes;
+            img.srcset = sources.srcset;
+        } else {
+            img.src = img.dataset.logo || img.dataset.fallback;
+        }
+    });
+}
+
+applyImageTags();
@@ -1,6 +1,13 @@
 // Function to load all dynamic data
 async function loadAllData() {
     try {
+        // One request for everything the homepage shows, when the bundle exists
+        const siteData = await loadSiteData();
+        if (siteData) {
+            renderSiteData(siteData);
+            return;
+        }
+        
         // Load players data for key players section
         await loadKeyPlayers();
         
@@ -12,10 +19,24 @@ async function loadAllData() {
     }
 }
 
+// Render the precomputed sections of site_data.json
+function renderSiteData(siteData) {
+    const presidentMatches = document.getElementById('president-matches');
+    if (presidentMatches) presidentMatches.textContent = siteData.squad.matches_played;
+    
+    const performers = siteData.top_performers;
+    if (performers.top_scorer) renderPerformerCard('top-scorer', performers.top_scorer);
+    if (performers.top_assister) renderPerformerCard('top-assister', performers.top_assister);
+    
+    renderRecentResults(siteData.recent_results);
+    updateTeamStatistics(siteData);
+    updatePresidentWinsLosses(siteData);
+}
+
 // Function to load key players data
 async function loadKeyPlayers() {
     try {
-        const response = await fetch('players.json');
+        const response = await fetchData('players.json');
         if (!response.ok) {
             throw new Error('Failed to load player data');
         }
@@ -36,12 +57,17 @@ async function loadKeyPlayers() {
 function updatePresidentStats(data) {
     let totalMatches = 0;
     
-    // Calculate team stats from players data
-    Object.values(data.players).forEach(player => {
-        if (player.apps > totalMatches) {
-            totalMatches = player.apps;
-        }
-    });
+    if (data.derived) {
+        // Precomputed by player_updater
+        totalMatches = data.derived.max_apps;
+    } else {
+        // Calculate team stats from players data
+        Object.values(data.players).forEach(player => {
+            if (player.apps > totalMatches) {
+                totalMatches = player.apps;
+            }
+        });
+    }
     
     // Update the president's stats
     const presidentMatches = document.getElementById('president-matches');
@@ -61,30 +87,32 @@ function updateTopPerformers(data) {
     // Find the player data for top scorer
     const topScorerData = data.players[topScorerName];
     if (topScorerData) {
-        document.getElementById('top-scorer-card').style.display = 'block';
-        document.getElementById('top-scorer-img').src = `https://api.dicebear.com/7.x/avataaars/svg?seed=${encodeURIComponent(topScorerName)}`;
-        document.getElementById('top-scorer-name').textContent = topScorerName;
-        document.getElementById('top-scorer-matches').textContent = topScorerData.apps || 0;
-        document.getElementById('top-scorer-goals').textContent = topScorerData.goals || 0;
-        document.getElementById('top-scorer-assists').textContent = topScorerData.assists || 0;
+        renderPerformerCard('top-scorer', { name: topScorerName, ...topScorerData });
     }
     
     // Find the player data for top assister
     const topAssisterData = data.players[topAssisterName];
     if (topAssisterData) {
-        document.getElementById('top-assister-card').style.display = 'block';
-        document.getElementById('top-assister-img').src = `https://api.dicebear.com/7.x/avataaars/svg?seed=${encodeURIComponent(topAssisterName)}`;
-        document.getElementById('top-assister-name').textContent = topAssisterName;
-        document.getElementById('top-assister-matches').textContent = topAssisterData.apps || 0;
-        document.getElementById('top-assister-goals').textContent = topAssisterData.goals || 0;
-        document.getElementById('top-assister-assists').textContent = topAssisterData.assists || 0;
+        renderPerformerCard('top-assister', { name: topAssisterName, ...topAssisterData });
     }
 }
 
+// Fill one key player card ('top-scorer' or 'top-assister') from {name, apps, goals, assists}
+function renderPerformerCard(prefix, player) {
+    document.getElementById(`${prefix}-card`).style.display = 'block';
+    const img = document.getElementById(`${prefix}-img`);
+    img.src = `https://api.dicebear.com/7.x/avataaars/svg?seed=${encodeURIComponent(player.name)}`;
+    applyPlayerPhoto(img, player.name, 120);
+    document.getElementById(`${prefix}-name`).textContent = player.name;
+    document.getElementById(`${prefix}-matches`).textContent = player.apps || 0;
+    document.getElementById(`${prefix}-goals`).textContent = player.goals || 0;
+    document.getElementById(`${prefix}-assists`).textContent = player.assists || 0;
+}
+
 // Function to load matches data
 async function loadMatchesData() {
     try {
-        const response = await fetch('matches.json');
+        const response = await fetchData('matches.json');
         if (!response.ok) {
             throw new Error('Failed to load matches data');
         }
@@ -108,17 +136,22 @@ async function loadMatchesData() {
 
 // Function to update recent results
 function updateRecentResults(matchesData) {
+    // Sort matches by date (newest first) and get recent ones
+    const recentMatches = matchesData.matches
+        .sort((a, b) => new Date(b.date) - new Date(a.date))
+        .slice(0, 3); // Get 3 most recent matches
+    
+    renderRecentResults(recentMatches);
+}
+
+// Render result cards for matches that are already newest first
+function renderRecentResults(recentMatches) {
     const matchesContainer = document.querySelector('#results .matches');
     if (!matchesContainer) return;
     
     // Clear existing content
     matchesContainer.innerHTML = '';
     
-    // Sort matches by date (newest first) and get recent ones
-    const recentMatches = matchesData.matches
-        .sort((a, b) => new Date(b.date) - new Date(a.date))
-        .slice(0, 3); // Get 3 most recent matches
-    
     recentMatches.forEach(match => {
         const matchCard = document.createElement('div');
         matchCard.className = 'card match-card';
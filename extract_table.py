@@ -2,54 +2,144 @@
 Extract league table data from sheet.htm and save as JSON
 """
 
-import json
 import re
-from bs4 import BeautifulSoup
 import os
+import sys
+import argparse
+import time
+from html.parser import HTMLParser
+from build_manifest import step_is_current, record_named_step
+from instrumentation import stage, get_logger, configure_logging, add_logging_arguments, write_profile
+import json_writer
+from partitions import configured_team
 
-def extract_table_data():
-    try:
-        # Read the HTML file
-        with open('sheet.htm', 'r', encoding='utf-8') as file:
-            html_content = file.read()
-        
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Find all table rows
-        rows = soup.find_all('tr')
-        teams = []
-        
-        # Process rows from 6 to 16 (where team data is located)
-        for i in range(6, 17):  # 6 to 16 inclusive
-            if i >= len(rows):
+log = get_logger('league_table')
+
+# Rows of the exported sheet that hold the league table (6 to 16 inclusive)
+FIRST_TEAM_ROW = 6
+LAST_TEAM_ROW = 16
+CHUNK_SIZE = 16 * 1024
+
+class TableRowParser(HTMLParser):
+    """
+    Event-driven reader for the <td> texts of a range of <tr> rows.
+
+    Only the cells of rows first..last are kept; `done` is set as soon as the
+    last wanted row closes, so the caller can stop feeding the rest of the file.
+    Cell text matches BeautifulSoup's get_text(strip=True).
+    """
+
+    def __init__(self, first, last):
+        super().__init__(convert_charrefs=True)
+        self.first = first
+        self.last = last
+        self.rows = {}
+        self.done = False
+        self._row_index = -1
+        self._row = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self._close_row()
+            self._row_index += 1
+            if self.first <= self._row_index <= self.last:
+                self._row = []
+        elif tag == 'td' and self._row is not None:
+            self._close_cell()
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if tag == 'td':
+            self._close_cell()
+        elif tag == 'tr':
+            self._close_row()
+        elif tag == 'table' and self._row_index >= self.first:
+            self._close_row()
+
+    def close(self):
+        super().close()
+        self._close_row()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            text = data.strip()
+            if text:
+                self._cell.append(text)
+
+    def _close_cell(self):
+        if self._cell is not None and self._row is not None:
+            self._row.append(''.join(self._cell))
+        self._cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self._row is not None:
+            self.rows[self._row_index] = self._row
+            if self._row_index >= self.last:
+                self.done = True
+        self._row = None
+
+def read_table_rows(html_path='sheet.htm', first=FIRST_TEAM_ROW, last=LAST_TEAM_ROW):
+    """
+    Stream an exported sheet and return {row index: [cell texts]} for rows
+    first..last, stopping once the last one has been read.
+    """
+    parser = TableRowParser(first, last)
+    with open(html_path, 'r', encoding='utf-8') as file:
+        while not parser.done:
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
                 break
-                
-            row = rows[i]
-            cells = row.find_all('td')
+            parser.feed(chunk)
+    if not parser.done:
+        parser.close()
+    return parser.rows
+
+def parse_league_table(html_path='sheet.htm'):
+    """League table rows of an exported sheet, sorted by position"""
+    rows = read_table_rows(html_path)
+    teams = []
+    
+    # Process rows from 6 to 16 (where team data is located)
+    for i in range(FIRST_TEAM_ROW, LAST_TEAM_ROW + 1):
+        if i not in rows:
+            break
+            
+        cells = rows[i]
+        
+        if len(cells) >= 11:
+            position = cells[1]
+            team_name = cells[2]
             
-            if len(cells) >= 11:
-                position = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-                team_name = cells[2].get_text(strip=True) if len(cells) > 2 else ""
+            # Only process rows with valid data
+            if position and team_name and position.isdigit():
+                team_data = {
+                    'position': int(position),
+                    'team': clean_team_name(team_name),
+                    'played': safe_int(cells[3]),
+                    'won': safe_int(cells[4]),
+                    'drawn': safe_int(cells[5]),
+                    'lost': safe_int(cells[6]),
+                    'goalsFor': safe_int(cells[7]),
+                    'goalsAgainst': safe_int(cells[8]),
+                    'goalDifference': safe_int(cells[9]),
+                    'points': safe_int(cells[10])
+                }
                 
-                # Only process rows with valid data
-                if position and team_name and position.isdigit():
-                    team_data = {
-                        'position': int(position),
-                        'team': clean_team_name(team_name),
-                        'played': safe_int(cells[3].get_text(strip=True)),
-                        'won': safe_int(cells[4].get_text(strip=True)),
-                        'drawn': safe_int(cells[5].get_text(strip=True)),
-                        'lost': safe_int(cells[6].get_text(strip=True)),
-                        'goalsFor': safe_int(cells[7].get_text(strip=True)),
-                        'goalsAgainst': safe_int(cells[8].get_text(strip=True)),
-                        'goalDifference': safe_int(cells[9].get_text(strip=True)),
-                        'points': safe_int(cells[10].get_text(strip=True))
-                    }
-                    
-                    teams.append(team_data)
+                teams.append(team_data)
+    
+    # Sort by position to ensure correct order
+    teams.sort(key=lambda x: x['position'])
+    return teams
+
+def extract_table_data(html_path='sheet.htm', output_path='league_data.json', db_path=None, team=None):
+    try:
+        with stage('table_parse'):
+            teams = parse_league_table(html_path)
         
-        # Sort by position to ensure correct order
-        teams.sort(key=lambda x: x['position'])
+        if db_path:
+            store_snapshot(db_path, teams, html_path)
         
         # Save to JSON file
         output_data = {
@@ -57,16 +147,15 @@ def extract_table_data():
             'teams': teams
         }
         
-        with open('league_data.json', 'w', encoding='utf-8') as json_file:
-            json.dump(output_data, json_file, ensure_ascii=False, indent=2)
+        json_writer.write_json(output_path, output_data)
         
-        print(f"✅ Successfully extracted data for {len(teams)} teams")
-        print(f"📊 Our team position: {get_our_team_position(teams)}")
+        log.info("✅ Successfully extracted data for %d teams", len(teams))
+        log.info("📊 Our team position: %s", get_our_team_position(teams, team))
         
         return True
         
     except Exception as e:
-        print(f"❌ Error extracting table data: {e}")
+        log.error("❌ Error extracting table data: %s", e)
         return False
 
 def clean_team_name(name):
@@ -104,19 +193,143 @@ def get_current_timestamp():
     from datetime import datetime
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-def get_our_team_position(teams):
-    """Find our team's position"""
+def get_our_team_position(teams, our_team=None):
+    """Find our team's position (default team: the first one in seasons.json)"""
+    our_team = our_team or configured_team()
     for team in teams:
-        if 'Μεγάλο Λειβάδι' in team['team']:
+        if our_team and our_team in team['team']:
             return team['position']
     return "Not found"
 
+def snapshot_date(html_path):
+    """Date of a snapshot: the last YYYY-MM-DD (or YYYYMMDD) in its path, else the file's mtime"""
+    from datetime import datetime
+    matches = re.findall(r'(20\d{2})[-_.]?(\d{2})[-_.]?(\d{2})', html_path)
+    if matches:
+        return '-'.join(matches[-1])
+    return datetime.fromtimestamp(os.path.getmtime(html_path)).strftime("%Y-%m-%d")
+
+def snapshot_source(html_path):
+    """Path of a snapshot relative to the working directory (absolute when outside it), '/'-separated"""
+    path = os.path.relpath(html_path)
+    if path.startswith('..'):
+        path = os.path.abspath(html_path)
+    return path.replace(os.sep, '/')
+
+def snapshot_id(html_path):
+    """File-name-safe id of a snapshot, unique per path: '2024-10/sheet.htm' -> '2024-10_sheet'"""
+    stem = os.path.splitext(snapshot_source(html_path))[0]
+    return re.sub(r'[^\w.-]+', '_', stem).strip('_')
+
+def expand_sources(patterns):
+    """Directories become their *.htm/*.html files, anything else is treated as a glob"""
+    import glob
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths += glob.glob(os.path.join(pattern, '*.htm')) + glob.glob(os.path.join(pattern, '*.html'))
+        else:
+            paths += glob.glob(pattern)
+    return sorted(set(paths))
+
+def store_snapshot(db_path, teams, html_path):
+    """Upsert one parsed table into the history database as a dated snapshot"""
+    import history_store
+    conn = history_store.connect(db_path)
+    with stage('history_upsert'):
+        history_store.upsert_standings(conn, teams, snapshot_date(html_path), snapshot_source(html_path))
+    conn.close()
+
+def _parse_snapshot(html_path):
+    """Worker: parse one export and time it"""
+    start = time.perf_counter()
+    teams = parse_league_table(html_path)
+    return html_path, teams, time.perf_counter() - start
+
+def extract_batch(sources, output_dir='league_snapshots', history_path='standings_history.json', workers=None, db_path=None):
+    """
+    Parse many league exports in parallel, one process per core by default.
+
+    Writes one '<snapshot id>.json' table per snapshot into output_dir and a
+    combined history {date: {snapshot id: teams}} to history_path; the id comes
+    from the export's path (see snapshot_id), so same-named exports in
+    different directories do not overwrite each other. Returns the number
+    of snapshots parsed; files that fail to parse are reported and skipped.
+    With db_path every snapshot is also upserted into the history database.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    paths = expand_sources(sources)
+    if not paths:
+        log.error("❌ No HTML exports found")
+        return 0
+    
+    os.makedirs(output_dir, exist_ok=True)
+    history = {}
+    snapshots = {}
+    parsed = 0
+    start = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_parse_snapshot, path): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                path, teams, elapsed = future.result()
+            except Exception as e:
+                log.error("❌ %s: %s", path, e)
+                continue
+            
+            name = snapshot_id(path)
+            date = snapshot_date(path)
+            snapshots[os.path.join(output_dir, f"{name}.json")] = {
+                'last_updated': get_current_timestamp(), 'date': date, 'source': path, 'teams': teams
+            }
+            history.setdefault(date, {})[name] = teams
+            if db_path:
+                store_snapshot(db_path, teams, path)
+            parsed += 1
+            log.info("✅ %s: %d teams in %.1f ms", path, len(teams), elapsed * 1000)
+    
+    history_data = {
+        'last_updated': get_current_timestamp(),
+        'snapshots': {date: history[date] for date in sorted(history)}
+    }
+    snapshots[history_path] = history_data
+    json_writer.write_many(snapshots)
+    
+    log.info("📊 Parsed %d/%d snapshots in %.2fs", parsed, len(paths), time.perf_counter() - start)
+    log.info("📁 History saved to: %s", history_path)
+    return parsed
+
 if __name__ == "__main__":
-    print("🔄 Extracting league table data from sheet.htm...")
-    success = extract_table_data()
+    parser = argparse.ArgumentParser(description="Extract the league table from sheet.htm into league_data.json")
+    parser.add_argument('--force', action='store_true', help="rebuild even if sheet.htm is unchanged")
+    parser.add_argument('--batch', nargs='+', metavar='DIR_OR_GLOB', help="parse many exports in parallel instead of sheet.htm")
+    parser.add_argument('--output-dir', default='league_snapshots', help="per-snapshot tables for --batch")
+    parser.add_argument('--history', default='standings_history.json', help="combined date-indexed history for --batch")
+    parser.add_argument('--workers', type=int, help="worker processes for --batch (default: all cores)")
+    parser.add_argument('--db', metavar='PATH', help="also store the table(s) in this history database (see history_store.py)")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(args.verbose, args.quiet)
+    
+    if args.batch:
+        sys.exit(0 if extract_batch(args.batch, args.output_dir, args.history, args.workers, args.db) else 1)
+    
+    if not args.force and step_is_current('league_table'):
+        log.info("✅ sheet.htm unchanged, league_data.json is up to date (use --force to rebuild)")
+        sys.exit(0)
+    
+    log.info("🔄 Extracting league table data from sheet.htm...")
+    success = extract_table_data(db_path=args.db)
     
     if success:
-        print("✅ Data extraction completed successfully!")
-        print("📁 Data saved to: league_data.json")
+        record_named_step('league_table')
+        log.info("✅ Data extraction completed successfully!")
+        log.info("📁 Data saved to: league_data.json")
     else:
-        print("❌ Data extraction failed!")
\ No newline at end of file
+        log.error("❌ Data extraction failed!")
+    
+    if args.profile:
+        write_profile(args.profile, command='extract_table')
@@ -0,0 +1,215 @@
+"""
+SQLite history of matches, per-match player lines and league table snapshots
+
+The updaters upsert into this store (results_updater/extract_table --db) so
+questions across seasons are indexed queries instead of re-parsing old
+workbooks:
+
+    python history_store.py career "Dixyle"
+    python history_store.py h2h "Γυπαετοί"
+    python history_store.py export --season 2024-2025 -o matches.json
+"""
+
+import argparse
+import json
+import sqlite3
+
+DB_PATH = 'history.sqlite3'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    season TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    location TEXT,
+    result TEXT,
+    outcome TEXT,
+    points INTEGER,
+    player_of_match TEXT,
+    UNIQUE (season, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (date);
+CREATE INDEX IF NOT EXISTS idx_matches_opponent ON matches (opponent);
+
+CREATE TABLE IF NOT EXISTS player_lines (
+    match_id INTEGER NOT NULL REFERENCES matches (id) ON DELETE CASCADE,
+    line INTEGER NOT NULL,
+    number INTEGER,
+    name TEXT NOT NULL,
+    position TEXT,
+    goals INTEGER,
+    assists INTEGER,
+    PRIMARY KEY (match_id, line)
+);
+CREATE INDEX IF NOT EXISTS idx_player_lines_name ON player_lines (name);
+
+CREATE TABLE IF NOT EXISTS standings (
+    snapshot_date TEXT NOT NULL,
+    source TEXT NOT NULL,
+    position INTEGER,
+    team TEXT NOT NULL,
+    played INTEGER,
+    won INTEGER,
+    drawn INTEGER,
+    lost INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    goal_difference INTEGER,
+    points INTEGER,
+    PRIMARY KEY (snapshot_date, source, team)
+);
+CREATE INDEX IF NOT EXISTS idx_standings_team ON standings (team);
+"""
+
+# 1: matches keyed on (season, seq); version 0 keyed them on (season, date,
+# opponent), which merged two matches with the same date and opponent
+SCHEMA_VERSION = 1
+
+MATCH_FIELDS = ['date', 'opponent', 'location', 'result', 'outcome', 'points', 'player_of_match']
+
+def _migrate(conn):
+    """Rebuild a version 0 matches table with the (season, seq) key, keeping its ids"""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'matches'").fetchone()
+    if exists and version < 1:
+        # the usual SQLite table rebuild: new table, copy, drop, rename
+        create = SCHEMA.split(';')[0].replace('IF NOT EXISTS matches', 'matches_new')
+        conn.executescript(f"""
+            PRAGMA foreign_keys = OFF;
+            BEGIN;
+            {create};
+            INSERT INTO matches_new SELECT * FROM matches;
+            DROP TABLE matches;
+            ALTER TABLE matches_new RENAME TO matches;
+            COMMIT;
+        """)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+def connect(path=DB_PATH):
+    """Open (and if needed create or migrate) the history database"""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    _migrate(conn)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+def upsert_matches(conn, matches, season):
+    """
+    Store a season's parsed matches (results_updater.parse_matches output).
+    Rows are keyed on the match's position in the workbook, so matches with
+    the same date and opponent (or no date) stay separate. The workbook is the
+    source of truth for the season, so rows past its last match are removed.
+    """
+    with conn:
+        for seq, match in enumerate(matches):
+            row = conn.execute(
+                """INSERT INTO matches (season, seq, date, opponent, location, result, outcome, points, player_of_match)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (season, seq) DO UPDATE SET
+                       date = excluded.date, opponent = excluded.opponent, location = excluded.location,
+                       result = excluded.result, outcome = excluded.outcome,
+                       points = excluded.points, player_of_match = excluded.player_of_match
+                   RETURNING id""",
+                [season, seq] + [match[field] for field in MATCH_FIELDS]
+            ).fetchone()
+            match_id = row['id']
+            conn.execute("DELETE FROM player_lines WHERE match_id = ?", (match_id,))
+            conn.executemany(
+                """INSERT INTO player_lines (match_id, line, number, name, position, goals, assists)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [(match_id, line, p['number'], p['name'], p['position'], p['goals'], p['assists'])
+                 for line, p in enumerate(match['players'])]
+            )
+        conn.execute("DELETE FROM matches WHERE season = ? AND seq >= ?", (season, len(matches)))
+
+def upsert_standings(conn, teams, snapshot_date, source):
+    """Store one league table snapshot (extract_table.parse_league_table output)"""
+    with conn:
+        conn.execute("DELETE FROM standings WHERE snapshot_date = ? AND source = ?", (snapshot_date, source))
+        conn.executemany(
+            """INSERT INTO standings (snapshot_date, source, position, team, played, won, drawn, lost,
+                                      goals_for, goals_against, goal_difference, points)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [(snapshot_date, source, t['position'], t['team'], t['played'], t['won'], t['drawn'], t['lost'],
+              t['goalsFor'], t['goalsAgainst'], t['goalDifference'], t['points']) for t in teams]
+        )
+
+def season_matches(conn, season):
+    """A season's matches in workbook order, in the matches.json shape"""
+    matches = []
+    rows = conn.execute("SELECT * FROM matches WHERE season = ? ORDER BY seq", (season,)).fetchall()
+    lines = {}
+    for line in conn.execute(
+            """SELECT match_id, number, name, position, goals, assists FROM player_lines
+               WHERE match_id IN (SELECT id FROM matches WHERE season = ?) ORDER BY match_id, line""", (season,)):
+        lines.setdefault(line['match_id'], []).append(
+            {key: line[key] for key in ('number', 'name', 'position', 'goals', 'assists')})
+    for row in rows:
+        match = {field: row[field] for field in MATCH_FIELDS}
+        match['players'] = lines.get(row['id'], [])
+        matches.append(match)
+    return matches
+
+def player_career(conn, name):
+    """Per-season apps/goals/assists/POM for one player"""
+    rows = conn.execute(
+        """SELECT m.season,
+                  COUNT(*) AS apps,
+                  SUM(l.goals) AS goals,
+                  SUM(l.assists) AS assists,
+                  SUM(m.player_of_match = l.name) AS pom
+           FROM player_lines l JOIN matches m ON m.id = l.match_id
+           WHERE l.name = ?
+           GROUP BY m.season ORDER BY m.season""", (name,)).fetchall()
+    return [dict(row) for row in rows]
+
+def head_to_head(conn, opponent):
+    """Every match against an opponent plus W/D/L totals"""
+    rows = conn.execute(
+        """SELECT season, date, location, result, outcome FROM matches
+           WHERE opponent = ? ORDER BY date""", (opponent,)).fetchall()
+    matches = [dict(row) for row in rows]
+    return {
+        'opponent': opponent,
+        'played': len(matches),
+        'wins': sum(1 for m in matches if m['outcome'] == 'W'),
+        'draws': sum(1 for m in matches if m['outcome'] == 'D'),
+        'losses': sum(1 for m in matches if m['outcome'] == 'L'),
+        'matches': matches
+    }
+
+def standings_history(conn, team):
+    """A team's position and points in every stored snapshot"""
+    rows = conn.execute(
+        """SELECT snapshot_date, source, position, points FROM standings
+           WHERE team = ? ORDER BY snapshot_date""", (team,)).fetchall()
+    return [dict(row) for row in rows]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the match/standings history database")
+    parser.add_argument('--db', default=DB_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('career', help="a player's per-season totals").add_argument('name')
+    commands.add_parser('h2h', help="record against an opponent").add_argument('opponent')
+    commands.add_parser('standings', help="a team's league positions over time").add_argument('team')
+    export = commands.add_parser('export', help="write a season's matches JSON from the database")
+    export.add_argument('--season', required=True)
+    export.add_argument('-o', '--output', default='matches.json')
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == 'career':
+        result = player_career(conn, args.name)
+    elif args.command == 'h2h':
+        result = head_to_head(conn, args.opponent)
+    elif args.command == 'standings':
+        result = standings_history(conn, args.team)
+    else:
+        from results_updater import build_matches_document, write_matches_json
+        write_matches_json(build_matches_document(season_matches(conn, args.season), season=args.season), args.output)
+        result = None
+    if result is not None:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
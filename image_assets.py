@@ -0,0 +1,189 @@
+"""
+Resized thumbnails of the player photos and club logos
+
+Usage: python image_assets.py [-o assets] [--widths 96 192 384] [--workers N] [--force] [-v | -q]
+
+Every roster entry of players.json is mapped to a photo in player_info/:
+first through player_photos.json ({"roster name": "file in player_info/"}),
+then by file name (the part before the first dot, compared like player
+names, see name_index.name_key). Players without a photo get
+club_placeholder.png. Each distinct source image plus the logos is resized to
+the fixed widths as WebP and JPEG on a process pool; sources whose content
+hash is unchanged since the last run are not processed again. Each JPEG is
+also copied to an unhashed <stem>-<width>.jpg, which the HTML uses as its
+static src so the page paints before the map is loaded.
+
+assets/images.json (minified) lists the thumbnails per logo and per player;
+players without a photo only name the shared placeholder logo entry.
+Resizing needs Pillow; without it the map points at the original files.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from instrumentation import stage, get_logger, configure_logging, add_logging_arguments, write_profile
+import json_writer
+from name_index import name_key
+
+PLAYERS_JSON = 'players.json'
+PHOTO_DIR = 'player_info'
+PHOTO_MAP_PATH = 'player_photos.json'
+PLACEHOLDER = 'club_placeholder.png'
+LOGOS = ['logo_mg-1.png', 'logo_mg.jpeg', PLACEHOLDER]
+ASSET_DIR = 'assets'
+IMAGE_MAP = 'images.json'
+CACHE_NAME = '.images.cache.json'
+WIDTHS = (96, 192, 384)
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80  # with method 4; method 6 is ~100x slower for ~3% smaller files
+# <stem>-<hash8>-<width>.<ext>, see thumbnail_name; the only files cleanup may remove
+THUMBNAIL_NAME = re.compile(r'^.+-[0-9a-f]{8}-\d+\.(webp|jpg)$')
+
+log = get_logger('images')
+
+def source_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def find_photos(roster, photo_dir=PHOTO_DIR, photo_map_path=PHOTO_MAP_PATH):
+    """{roster name: photo path or None}"""
+    photo_map = {}
+    if os.path.exists(photo_map_path):
+        with open(photo_map_path, encoding='utf-8') as f:
+            photo_map = json.load(f)
+    by_stem = {}
+    if os.path.isdir(photo_dir):
+        for file_name in sorted(os.listdir(photo_dir)):
+            by_stem.setdefault(name_key(file_name.split('.')[0]), file_name)
+
+    photos = {}
+    for name in roster:
+        file_name = photo_map.get(name) or by_stem.get(name_key(name))
+        path = os.path.join(photo_dir, file_name) if file_name else None
+        if path and not os.path.exists(path):
+            log.warning("⚠️ Photo %s for %s not found, using the placeholder", path, name)
+            path = None
+        photos[name] = path
+    return photos
+
+def thumbnail_name(source, digest, width, ext):
+    stem = os.path.basename(source).split('.')[0]
+    return f"{stem}-{digest[:8]}-{width}.{ext}"
+
+def static_name(source, width):
+    """Unhashed JPEG name for static <img src> attributes"""
+    return f"{os.path.basename(source).split('.')[0]}-{width}.jpg"
+
+def render_thumbnails(source, digest, widths, output_dir):
+    """Worker: write WebP and JPEG copies of one image at each width (never upscaled)"""
+    from PIL import Image
+
+    thumbnails = []
+    with Image.open(source) as image:
+        image.load()
+        rgba = image.convert('RGBA')
+        # JPEG has no alpha: flatten transparent logos onto white
+        flat = Image.new('RGB', rgba.size, (255, 255, 255))
+        flat.paste(rgba, mask=rgba.getchannel('A'))
+        for width in sorted({min(width, image.width) for width in widths}):
+            height = max(1, round(image.height * width / image.width))
+            entry = {'width': width, 'height': height}
+            for ext, picture, options in (('webp', rgba, {'quality': WEBP_QUALITY, 'method': 4}),
+                                          ('jpg', flat, {'quality': JPEG_QUALITY, 'optimize': True, 'progressive': True})):
+                name = thumbnail_name(source, digest, width, ext)
+                picture.resize((width, height), Image.LANCZOS).save(os.path.join(output_dir, name), **options)
+                entry['webp' if ext == 'webp' else 'jpeg'] = f"{output_dir}/{name}"
+            shutil.copyfile(os.path.join(output_dir, thumbnail_name(source, digest, width, 'jpg')),
+                            os.path.join(output_dir, static_name(source, width)))
+            thumbnails.append(entry)
+    return source, thumbnails
+
+def _load_cache(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _cache_is_current(entry, digest, widths, source, output_dir):
+    if not entry or entry.get('sha256') != digest or entry.get('widths') != list(widths):
+        return False
+    return all(os.path.exists(path) for thumb in entry['thumbnails']
+               for path in (thumb['webp'], thumb['jpeg'], os.path.join(output_dir, static_name(source, thumb['width']))))
+
+def build_image_assets(players_json=PLAYERS_JSON, output_dir=ASSET_DIR, widths=WIDTHS, workers=None, force=False):
+    """Write the thumbnails and assets/images.json; returns the image map"""
+    with open(players_json, encoding='utf-8') as f:
+        roster = json.load(f).get('players', {})
+    with stage('photo_lookup'):
+        photos = find_photos(roster)
+    sources = sorted({path for path in photos.values() if path} | set(LOGOS))
+
+    os.makedirs(output_dir, exist_ok=True)
+    cache_path = os.path.join(output_dir, CACHE_NAME)
+    cache = {} if force else _load_cache(cache_path)
+    with stage('hashing'):
+        digests = {source: source_hash(source) for source in sources}
+    todo = [source for source in sources if not _cache_is_current(cache.get(source), digests[source], widths, source, output_dir)]
+
+    try:
+        import PIL  # noqa: F401
+        have_pil = True
+    except ImportError:
+        have_pil = False
+        log.warning("⚠️ Pillow is not installed, images.json points at the original files")
+
+    thumbnails = {source: cache[source]['thumbnails'] for source in sources if source not in todo}
+    if have_pil and todo:
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_context
+        with stage('resize'):
+            # spawn: update_all calls this from a pool thread while other steps run
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+                futures = [pool.submit(render_thumbnails, source, digests[source], widths, output_dir) for source in todo]
+                for future in futures:
+                    source, result = future.result()
+                    thumbnails[source] = result
+                    cache[source] = {'sha256': digests[source], 'widths': list(widths), 'thumbnails': result}
+        json_writer.write_json(cache_path, {source: cache[source] for source in sources if source in cache})
+    log.info("🖼️ %d images, %d resized, %d unchanged", len(sources), len(todo) if have_pil else 0, len(sources) - len(todo))
+
+    def entry(source):
+        return {'source': source, 'photo': True, 'thumbnails': thumbnails.get(source, [])}
+
+    image_map = {
+        'widths': list(widths),
+        'players': {name: entry(path) if path else {'photo': False, 'logo': PLACEHOLDER}
+                    for name, path in photos.items()},
+        'logos': {logo: entry(logo) for logo in LOGOS}
+    }
+    json_writer.write_json(os.path.join(output_dir, IMAGE_MAP), image_map, indent=None)
+
+    # thumbnails of sources that changed or went away
+    current = {os.path.basename(path) for thumbs in thumbnails.values() for thumb in thumbs
+               for path in (thumb['webp'], thumb['jpeg'])}
+    for name in os.listdir(output_dir):
+        if THUMBNAIL_NAME.match(name) and name not in current:
+            os.remove(os.path.join(output_dir, name))
+    return image_map
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resize player photos and logos into WebP/JPEG thumbnails")
+    parser.add_argument('-o', '--output-dir', default=ASSET_DIR)
+    parser.add_argument('--widths', type=int, nargs='+', default=list(WIDTHS), help="thumbnail widths in pixels")
+    parser.add_argument('--workers', type=int, help="worker processes (default: all cores)")
+    parser.add_argument('--force', action='store_true', help="resize every image even if unchanged")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(args.verbose, args.quiet)
+
+    build_image_assets(output_dir=args.output_dir, widths=tuple(args.widths), workers=args.workers, force=args.force)
+    if args.profile:
+        write_profile(args.profile, command='image_assets')
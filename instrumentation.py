@@ -0,0 +1,89 @@
+"""
+Stage timers and log setup shared by the updaters
+
+Stages (workbook open, sheet read, segmentation, extraction, aggregation,
+serialization, write, ...) are timed with `with stage('name'):` and can be
+dumped as a JSON report with write_profile. Per-row and per-match messages
+are logged at DEBUG level with %-style arguments, so a normal run never
+formats them. The logging package itself is only imported when a logger is
+first used, which keeps it out of the updaters' import time.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+LOGGER_NAME = 'megalivadi'
+DEBUG = 10  # logging.DEBUG, without importing logging
+
+# stage name -> {'seconds': total, 'calls': count}, in first-seen order
+_timings = {}
+_timings_lock = threading.Lock()  # update_all runs steps on several threads
+
+class LazyLogger:
+    """Stands in for logging.getLogger(name) and creates it on first use"""
+
+    def __init__(self, name):
+        self._name = name
+        self._logger = None
+
+    def __getattr__(self, attr):
+        if self._logger is None:
+            import logging
+            self._logger = logging.getLogger(self._name)
+        return getattr(self._logger, attr)
+
+def get_logger(name):
+    return LazyLogger(f"{LOGGER_NAME}.{name}")
+
+def configure_logging(verbose=False, quiet=False):
+    """INFO by default, DEBUG with verbose (per-row detail), WARNING with quiet"""
+    import logging
+    level = logging.DEBUG if verbose else logging.WARNING if quiet else logging.INFO
+    logger = logging.getLogger(LOGGER_NAME)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+def add_logging_arguments(parser, profile=True):
+    """-v/--verbose, -q/--quiet and (unless profile=False) --profile PATH for an updater CLI"""
+    parser.add_argument('-v', '--verbose', action='store_true', help="log every parsed row/match")
+    parser.add_argument('-q', '--quiet', action='store_true', help="only log warnings and errors")
+    if profile:
+        parser.add_argument('--profile', metavar='PATH', help="write a JSON report of stage timings")
+
+@contextmanager
+def stage(name):
+    """Time a pipeline stage; repeated stages accumulate"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _timings_lock:
+            entry = _timings.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            entry['seconds'] += elapsed
+            entry['calls'] += 1
+
+def get_timings():
+    return {name: dict(entry) for name, entry in _timings.items()}
+
+def reset_timings():
+    _timings.clear()
+
+def write_profile(path, **extra):
+    """Write the collected stage timings (plus any extra fields) as JSON"""
+    import json
+    from datetime import datetime
+    report = {
+        'generated': datetime.now().isoformat(),
+        'total_seconds': sum(entry['seconds'] for entry in _timings.values()),
+        'stages': get_timings()
+    }
+    report.update(extra)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
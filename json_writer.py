@@ -0,0 +1,81 @@
+"""
+Atomic JSON output shared by the updaters
+
+Documents are serialised with orjson when it is installed (stdlib json
+otherwise, same layout), written to a temporary file next to the target and
+moved into place with os.replace, so the site never serves a half-written
+file. A write is skipped when the file on disk already holds exactly the
+same bytes. write_many writes independent outputs on a thread pool.
+"""
+
+import json
+import os
+
+from instrumentation import stage
+
+_orjson = None  # looked up on the first dumps: the module, or False when not installed
+
+def _load_orjson():
+    global _orjson
+    if _orjson is None:
+        try:
+            import orjson
+            _orjson = orjson
+        except ImportError:
+            _orjson = False
+    return _orjson
+
+def dumps(data, indent=2):
+    """UTF-8 bytes of `data`; indent=2 matches json.dumps(..., indent=2), None is minified"""
+    orjson = _load_orjson()
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, ensure_ascii=False, indent=indent).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _same_bytes(path, payload):
+    try:
+        if os.path.getsize(path) != len(payload):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == payload
+    except FileNotFoundError:
+        return False
+
+def write_bytes(path, payload):
+    """Atomically replace `path` with `payload`; returns False when it already had those bytes"""
+    if _same_bytes(path, payload):
+        return False
+    import tempfile
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644  # mkstemp creates 0600, the web server must be able to read it
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+def write_json(path, data, indent=2):
+    """Serialise and atomically write one document; returns whether the file changed"""
+    with stage('serialization'):
+        payload = dumps(data, indent)
+    with stage('write'):
+        return write_bytes(path, payload)
+
+def write_many(documents, indent=2, workers=None):
+    """Write {path: document} concurrently; returns {path: changed}"""
+    if len(documents) < 2:
+        return {path: write_json(path, data, indent) for path, data in documents.items()}
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {path: pool.submit(write_json, path, data, indent) for path, data in documents.items()}
+        return {path: future.result() for path, future in futures.items()}
@@ -0,0 +1,103 @@
+"""
+Resolve the player names used in Φύλλο2 and POM rows to the 'Static Info' roster
+
+The sheets do not spell names the same way: the roster has role suffixes
+("Δημητράκης (C)"), some cells have stray spaces, and Greek and Latin
+lookalike letters are mixed ("Mάο" with a Latin M vs "Μάο" with a Greek Μ).
+PlayerNameIndex is built once per run from the roster and tries, in order:
+
+1. the exact roster name
+2. a normalised key: NFKC, accents dropped, whitespace collapsed, case and
+   Greek/Latin lookalikes folded, trailing role suffix like "(C)" removed
+3. the alias table (player_aliases.json, {"name as written": "roster name"})
+4. the jersey number, when exactly one roster player wears it
+
+Results are cached per (name, number), so each distinct spelling is worked
+out once. Names that resolve to nobody are counted in `unresolved`, and names
+credited to a roster player only through the jersey number (possibly a guest
+wearing that shirt) in `by_number`, so both show up in the report.
+"""
+
+import json
+import os
+import re
+import unicodedata
+
+ALIASES_PATH = 'player_aliases.json'
+
+# Greek capitals that look like Latin capitals, folded before casefolding
+# (so "Η" meets "H" rather than "n"), then Greek lowercase lookalikes
+UPPER_CONFUSABLES = str.maketrans('ΑΒΕΖΗΙΚΜΝΟΡΤΥΧ', 'ABEZHIKMNOPTYX')
+LOWER_CONFUSABLES = str.maketrans('αικνορτυχ', 'aiknoptux')
+ROLE_SUFFIX = re.compile(r'\s*\([^()]{1,3}\)$')
+
+def name_key(name):
+    """Spelling-insensitive key of a player name"""
+    text = unicodedata.normalize('NFKC', str(name))
+    text = ''.join(ch for ch in unicodedata.normalize('NFD', text) if not unicodedata.combining(ch))
+    text = ' '.join(text.split())
+    text = text.translate(UPPER_CONFUSABLES).casefold().translate(LOWER_CONFUSABLES)
+    return ROLE_SUFFIX.sub('', text)
+
+def load_aliases(path=ALIASES_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+class PlayerNameIndex:
+    """Memoised name -> roster name lookups; see the module docstring for the rules"""
+
+    def __init__(self, roster, aliases=None):
+        self.roster = roster
+        self._by_key = {}
+        for name in roster:
+            self._by_key.setdefault(name_key(name), name)
+        self._aliases = {name_key(alias): target for alias, target in (aliases or {}).items() if target in roster}
+
+        numbers = {}
+        for name, info in roster.items():
+            number = info.get('jersey_number') if isinstance(info, dict) else None
+            if number is not None:
+                numbers.setdefault(number, []).append(name)
+        self._by_number = {number: names[0] for number, names in numbers.items() if len(names) == 1}
+
+        self._cache = {}
+        self.unresolved = {}
+        self.by_number = {}
+
+    def resolve(self, name, number=None):
+        """Roster name for `name` (optionally with its jersey number), or None"""
+        cache_key = (name, number)
+        if cache_key in self._cache:
+            resolved, via_number = self._cache[cache_key]
+        else:
+            resolved, via_number = self._cache[cache_key] = self._lookup(name, number)
+        if resolved is None and name:
+            self.unresolved[name] = self.unresolved.get(name, 0) + 1
+        if via_number:
+            self.by_number[(name, resolved)] = self.by_number.get((name, resolved), 0) + 1
+        return resolved
+
+    def _lookup(self, name, number):
+        """(roster name or None, whether only the jersey number matched)"""
+        if not name:
+            return None, False
+        if name in self.roster:
+            return name, False
+        key = name_key(name)
+        if key in self._by_key:
+            return self._by_key[key], False
+        if key in self._aliases:
+            return self._aliases[key], False
+        resolved = self._by_number.get(number)
+        return resolved, resolved is not None
+
+    def report(self):
+        """Unresolved names, most frequent first: [(name, occurrences)]"""
+        return sorted(self.unresolved.items(), key=lambda item: (-item[1], item[0]))
+
+    def number_report(self):
+        """Names credited by jersey number only, most frequent first: [(name, roster name, occurrences)]"""
+        return sorted(((name, resolved, count) for (name, resolved), count in self.by_number.items()),
+                      key=lambda item: (-item[2], item[0]))
@@ -0,0 +1,183 @@
+"""
+Build every (season, team) partition listed in seasons.json
+
+Usage: python partitions.py [--config seasons.json] [-o seasons] [--workers N] [--force] [-v | -q]
+
+seasons.json lists one entry per partition:
+
+    {"partitions": [
+        {"id": "first-team", "season": "2024-2025", "team": "Μεγάλο Λειβάδι",
+         "workbook": "ΜΕΓΑ ΛΙΒΑΔΙ FC.xlsx", "league_export": "sheet.htm"}
+    ]}
+
+Each partition is built into seasons/<season>/<id>/ (matches.json and its
+matches/ shards, players.json, league_data.json and site_data.json) in its own process, so
+several seasons and teams build in parallel; partitions whose workbook,
+league export, aliases, entry and code are unchanged are skipped.
+seasons/index.json lists the built partitions; a page opened with
+?season=...&team=... loads that partition's files (see data_fetch.js).
+
+The same file also supplies the season and team of the single-workbook
+updaters (configured_season, configured_team), so neither is hard-coded.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from build_manifest import is_up_to_date, record_step
+from instrumentation import get_logger, configure_logging, add_logging_arguments, write_profile
+import json_writer
+
+CONFIG_PATH = 'seasons.json'
+OUTPUT_ROOT = 'seasons'
+INDEX_NAME = 'index.json'
+CODE_FILES = ['results_updater.py', 'player_updater.py', 'extract_table.py', 'bundle.py',
+              'workbook_loader.py', 'name_index.py', 'partitions.py', 'json_writer.py', 'instrumentation.py']
+
+log = get_logger('partitions')
+
+def load_partitions(path=CONFIG_PATH):
+    """The configured partitions, or [] without a config file"""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f).get('partitions', [])
+
+def _partition_for(workbook, path=CONFIG_PATH):
+    for partition in load_partitions(path):
+        if os.path.abspath(partition['workbook']) == os.path.abspath(workbook):
+            return partition
+    return None
+
+def configured_season(workbook, path=CONFIG_PATH):
+    """Season of the partition built from `workbook`, or None when it is not configured"""
+    partition = _partition_for(workbook, path)
+    return partition['season'] if partition else None
+
+def configured_team(workbook=None, path=CONFIG_PATH):
+    """Our team's name for `workbook` (default: the first partition), or None"""
+    partition = _partition_for(workbook, path) if workbook else None
+    partitions = load_partitions(path)
+    if partition is None and partitions:
+        partition = partitions[0]
+    return partition['team'] if partition else None
+
+def partition_dir(partition, output_root=OUTPUT_ROOT):
+    return os.path.join(output_root, partition['season'], partition['id'])
+
+def partition_outputs(partition, output_root=OUTPUT_ROOT):
+    names = ['matches.json', 'matches/index.json', 'players.json', 'site_data.json']
+    if partition.get('league_export'):
+        names.append('league_data.json')
+    directory = partition_dir(partition, output_root)
+    return {name: os.path.join(directory, *name.split('/')) for name in names}
+
+def partition_step(partition):
+    """Manifest step name; it changes with the entry, so editing one entry only rebuilds that partition"""
+    import hashlib
+    entry = json.dumps(partition, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return f"partition:{partition['season']}/{partition['id']}:{hashlib.sha1(entry).hexdigest()[:8]}"
+
+def partition_inputs(partition):
+    from name_index import ALIASES_PATH
+    sources = [partition['workbook']] + ([partition['league_export']] if partition.get('league_export') else [])
+    return sources + [ALIASES_PATH] + CODE_FILES
+
+def build_partition(partition, output_root=OUTPUT_ROOT):
+    """Worker: build one partition's JSON files; returns the elapsed seconds"""
+    from workbook_loader import load_sheets, MATCH_SHEET
+    from results_updater import parse_matches, update_matches, SHARD_DIR
+    from player_updater import update_player_json
+    from extract_table import extract_table_data
+    from bundle import write_site_data
+
+    start = time.perf_counter()
+    outputs = partition_outputs(partition, output_root)
+    os.makedirs(partition_dir(partition, output_root), exist_ok=True)
+
+    sheets = load_sheets(partition['workbook'])
+    matches = parse_matches(sheets[MATCH_SHEET])
+    update_matches(partition['workbook'], outputs['matches.json'], season=partition['season'], matches=matches,
+                   shard_dir=os.path.join(partition_dir(partition, output_root), SHARD_DIR))
+    if not update_player_json(partition['workbook'], outputs['players.json'], sheets=sheets, matches=matches):
+        raise RuntimeError(f"no player data in {partition['workbook']}")
+    sources = {'players': outputs['players.json'], 'matches': outputs['matches.json']}
+    if 'league_data.json' in outputs:
+        if not extract_table_data(partition['league_export'], outputs['league_data.json'], team=partition['team']):
+            raise RuntimeError(f"could not read {partition['league_export']}")
+        sources['league'] = outputs['league_data.json']
+    write_site_data(outputs['site_data.json'], sources=sources, team=partition['team'])
+    return time.perf_counter() - start
+
+def season_index(partitions, output_root=OUTPUT_ROOT):
+    """
+    {seasons: {season: [partition summary]}}, newest season first.
+    Only partitions whose outputs all exist are listed. There is no timestamp,
+    so an unchanged index is not rewritten.
+    """
+    seasons = {}
+    built = [p for p in partitions if all(os.path.exists(path) for path in partition_outputs(p, output_root).values())]
+    for partition in sorted(built, key=lambda p: p['season'], reverse=True):
+        seasons.setdefault(partition['season'], []).append({
+            'id': partition['id'],
+            'team': partition['team'],
+            'path': partition_dir(partition, output_root).replace(os.sep, '/'),
+            'files': sorted(partition_outputs(partition, output_root))
+        })
+    return {'seasons': seasons}
+
+def build_partitions(config_path=CONFIG_PATH, output_root=OUTPUT_ROOT, workers=None, force=False):
+    """Build the stale partitions in parallel and write the season index; returns {step: status}"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    partitions = load_partitions(config_path)
+    status = {}
+    todo = []
+    for partition in partitions:
+        step = partition_step(partition)
+        name = f"{partition['season']}/{partition['id']}"
+        if not force and is_up_to_date(step, partition_inputs(partition), list(partition_outputs(partition, output_root).values())):
+            status[name] = 'skipped'
+        else:
+            todo.append((name, step, partition))
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers or len(todo)) as pool:
+            futures = [(name, step, partition, pool.submit(build_partition, partition, output_root))
+                       for name, step, partition in todo]
+            for name, step, partition, future in futures:
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    log.error("❌ %s: %s", name, e)
+                    status[name] = 'failed'
+                    continue
+                # the manifest is only written from this process
+                record_step(step, partition_inputs(partition), list(partition_outputs(partition, output_root).values()))
+                status[name] = 'updated'
+                log.info("✅ %s built in %.2fs", name, seconds)
+
+    os.makedirs(output_root, exist_ok=True)
+    json_writer.write_json(os.path.join(output_root, INDEX_NAME), season_index(partitions, output_root))
+    return {name: status[name] for name in sorted(status)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build every configured season/team partition and the season index")
+    parser.add_argument('--config', default=CONFIG_PATH)
+    parser.add_argument('-o', '--output-root', default=OUTPUT_ROOT)
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per stale partition)")
+    parser.add_argument('--force', action='store_true', help="rebuild every partition even if unchanged")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(args.verbose, args.quiet)
+
+    status = build_partitions(args.config, args.output_root, args.workers, args.force)
+    for name, state in status.items():
+        print(f"{name}: {state}")
+    if args.profile:
+        write_profile(args.profile, command='partitions')
+    if 'failed' in status.values():
+        sys.exit(1)
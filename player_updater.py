@@ -1,121 +1,144 @@
-import pandas as pd
 import json
 import os
+import argparse
 from datetime import datetime
+from build_manifest import step_is_current, record_named_step
+from workbook_loader import load_sheets, EXCEL_PATH, MATCH_SHEET, STATIC_SHEET
+from instrumentation import stage, get_logger, configure_logging, add_logging_arguments, write_profile, DEBUG
+import json_writer
+from name_index import PlayerNameIndex, load_aliases, ALIASES_PATH
 
-def extract_player_data_from_excel(file_path):
+log = get_logger('players')
+
+def read_static_info(df_static):
     """
-    Extract player data from all sheets in the Excel file
+    Roster from the 'Static Info' sheet: {name: static fields with zeroed stats}
     """
-    try:
-        # Read with openpyxl engine
-        df_sheet1 = pd.read_excel(file_path, sheet_name='Φύλλο1', engine='openpyxl')
-        df_sheet2 = pd.read_excel(file_path, sheet_name='Φύλλο2', engine='openpyxl')
-        df_static = pd.read_excel(file_path, sheet_name='Static Info', engine='openpyxl')
-        
-        players = {}
+    import pandas as pd
+
+    players = {}
+    for index, row in df_static.iterrows():
+        player_name = row.iloc[2] if len(row) > 2 else None  # Column C (Name)
         
-        # FIRST: Get static information from Static Info sheet
-        for index, row in df_static.iterrows():
-            player_name = row.iloc[2] if len(row) > 2 else None  # Column C (Name)
+        if pd.isna(player_name) or player_name in ['Name', 'Static Info', None]:
+            continue
             
-            if pd.isna(player_name) or player_name in ['Name', 'Static Info', None]:
+        players[player_name] = {
+            'jersey_number': int(row.iloc[1]) if len(row) > 1 and not pd.isna(row.iloc[1]) else 0,
+            'age': int(row.iloc[3]) if len(row) > 3 and not pd.isna(row.iloc[3]) else 0,
+            'height': f"{int(row.iloc[4])}cm" if len(row) > 4 and not pd.isna(row.iloc[4]) else "N/A",
+            'position': str(row.iloc[5]) if len(row) > 5 and not pd.isna(row.iloc[5]) else "N/A",
+            'apps': 0,
+            'goals': 0, 
+            'assists': 0,
+            'pom': 0
+        }
+    return players
+
+def aggregate_player_stats(matches, roster, index=None):
+    """
+    Fold parsed matches (results_updater.parse_matches) into per-player totals.
+
+    Every player line of a match is an appearance; goals, assists and POM
+    awards are summed. Names are matched to the roster through a
+    PlayerNameIndex (pass one in to read its `unresolved` report afterwards);
+    lines that match nobody are not counted. Returns {roster name: {apps, goals, assists, pom}}.
+    """
+    if index is None:
+        index = PlayerNameIndex(roster, load_aliases())
+    totals = {name: {'apps': 0, 'goals': 0, 'assists': 0, 'pom': 0} for name in roster}
+    
+    for match in matches:
+        for line in match['players']:
+            name = index.resolve(line['name'], line['number'])
+            if name is None:
                 continue
-                
-            players[player_name] = {
-                'jersey_number': int(row.iloc[1]) if len(row) > 1 and not pd.isna(row.iloc[1]) else 0,
-                'age': int(row.iloc[3]) if len(row) > 3 and not pd.isna(row.iloc[3]) else 0,
-                'height': f"{int(row.iloc[4])}cm" if len(row) > 4 and not pd.isna(row.iloc[4]) else "N/A",
-                'position': str(row.iloc[5]) if len(row) > 5 and not pd.isna(row.iloc[5]) else "N/A",
-                'apps': 0,
-                'goals': 0, 
-                'assists': 0,
-                'pom': 0
-            }
+            totals[name]['apps'] += 1
+            totals[name]['goals'] += line['goals']
+            totals[name]['assists'] += line['assists']
         
-        # MANUAL CALCULATION: Parse match data from Sheet2 to calculate stats
-        print("Calculating stats from match data...")
+        pom = index.resolve(match['player_of_match'])
+        if pom is not None:
+            totals[pom]['pom'] += 1
+    
+    return totals
+
+def extract_player_data_from_excel(file_path, sheets=None, matches=None):
+    """
+    Extract player data from all sheets in the Excel file
+
+    `sheets` may be an already loaded {sheet name: DataFrame} mapping (see
+    workbook_loader.load_sheets) and `matches` an already parsed match list
+    (results_updater.parse_matches); whatever is missing is loaded/parsed here.
+    """
+    try:
+        if sheets is None:
+            sheets = load_sheets(file_path)
         
-        current_match_date = None
-        pom_candidates = []
-        match_players = set()
+        # FIRST: Get static information from Static Info sheet
+        with stage('extraction'):
+            players = read_static_info(sheets[STATIC_SHEET])
         
-        for index, row in df_sheet2.iterrows():
-            if len(row) < 3:
-                continue
-                
-            if 'Date' in str(row.iloc[0]) and len(row) > 2:
-                current_match_date = row.iloc[2]
-                print(f"Found match date: {current_match_date}")
-                match_players = set()  # Reset for new match
-            
-            # Check for Player of the Match
-            elif 'Player of the Match' in str(row.iloc[0]) and len(row) > 3:
-                pom_name = row.iloc[3]
-                if pd.notna(pom_name) and pom_name != '' and pom_name != 'Player of the Match':
-                    print(f"Found Player of the Match: {pom_name}")
-                    if pom_name in players:
-                        players[pom_name]['pom'] += 1
-                        print(f"Awarded POM to: {pom_name}")
-            
-            elif (pd.notna(row.iloc[1]) and 
-                  str(row.iloc[1]).isdigit() and 
-                  pd.notna(row.iloc[2]) and 
-                  isinstance(row.iloc[2], str) and
-                  row.iloc[2] in players):
-                
-                player_name = row.iloc[2]
-                played = row.iloc[3] if len(row) > 3 else None
-                goals = row.iloc[4] if len(row) > 4 else 0
-                assists = row.iloc[5] if len(row) > 5 else 0
-                
-                debug_info = f"Player: {player_name}, Played: {played}, Goals: {goals}, Assists: {assists}"
-                
-                if (pd.notna(played) and played != 0 and played != '0' and 
-                    played != ''):
-                    players[player_name]['apps'] += 1
-                    match_players.add(player_name)
-                    debug_info += f" → APPEARANCE (#{players[player_name]['apps']})"
-                
-                # Add goals
-                if pd.notna(goals):
-                    try:
-                        goal_count = int(goals)
-                        if goal_count > 0:
-                            old_goals = players[player_name]['goals']
-                            players[player_name]['goals'] += goal_count
-                            debug_info += f" → +{goal_count} GOALS (total: {players[player_name]['goals']})"
-                    except (ValueError, TypeError):
-                        pass
-                
-                # Add assists  
-                if pd.notna(assists):
-                    try:
-                        assist_count = int(assists)
-                        if assist_count > 0:
-                            old_assists = players[player_name]['assists']
-                            players[player_name]['assists'] += assist_count
-                            debug_info += f" → +{assist_count} ASSISTS (total: {players[player_name]['assists']})"
-                    except (ValueError, TypeError):
-                        pass
-                
-                print(debug_info)
+        # Then fold the parsed matches into the stats
+        log.info("Calculating stats from match data...")
+        if matches is None:
+            from results_updater import parse_matches
+            matches = parse_matches(sheets[MATCH_SHEET])
+        
+        with stage('aggregation'):
+            index = PlayerNameIndex(players, load_aliases())
+            for player_name, stats in aggregate_player_stats(matches, players, index).items():
+                players[player_name].update(stats)
+        for name, count in index.report():
+            log.warning("Unresolved player name %r (%dx), add it to %s", name, count, ALIASES_PATH)
+        for name, resolved, count in index.number_report():
+            log.warning("Player name %r credited to %r by jersey number only (%dx), add it to %s if that is right",
+                        name, resolved, count, ALIASES_PATH)
         
-        print(f"\nManual calculation completed for {len(players)} players")
+        log.info("Calculation completed for %d players from %d matches", len(players), len(matches))
         
-        # Print summary of top performers
-        print("\n=== CALCULATION SUMMARY ===")
-        for player_name, stats in sorted(players.items(), key=lambda x: x[1]['goals'], reverse=True)[:5]:
-            print(f"{player_name}: {stats['goals']} goals, {stats['assists']} assists, {stats['apps']} apps, {stats['pom']} POM")
+        # Summary of top performers
+        if log.isEnabledFor(DEBUG):
+            log.debug("=== CALCULATION SUMMARY ===")
+            for player_name, stats in sorted(players.items(), key=lambda x: x[1]['goals'], reverse=True)[:5]:
+                log.debug("%s: %d goals, %d assists, %d apps, %d POM", player_name, stats['goals'], stats['assists'], stats['apps'], stats['pom'])
         
         return players
         
     except Exception as e:
-        print(f"Error reading Excel file: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error reading Excel file: %s", e)
         return {}
 
+def compute_top_performers(players):
+    """Top scorer and top assister of a {name: stats} mapping"""
+    top_scorer = max(players.items(), key=lambda x: x[1].get('goals', 0))
+    top_assister = max(players.items(), key=lambda x: x[1].get('assists', 0))
+    return {
+        'top_scorer': {
+            'name': top_scorer[0],
+            'goals': top_scorer[1].get('goals', 0)
+        },
+        'top_assister': {
+            'name': top_assister[0],
+            'assists': top_assister[1].get('assists', 0)
+        }
+    }
+
+def compute_player_derived(players):
+    """Build-time lookups for the frontend: most appearances and goals+assists per appearance"""
+    contributions = {}
+    for name, stats in players.items():
+        apps = stats.get('apps', 0)
+        total = stats.get('goals', 0) + stats.get('assists', 0)
+        contributions[name] = {
+            'goal_contributions': total,
+            'per_appearance': round(total / apps, 2) if apps else 0.0
+        }
+    return {
+        'max_apps': max((stats.get('apps', 0) for stats in players.values()), default=0),
+        'contributions': contributions
+    }
+
 def create_player_json(players_data, output_path='players.json'):
     """
     Create JSON file with player data
@@ -125,21 +148,24 @@ def create_player_json(players_data, output_path='players.json'):
         'metadata': {
             'last_updated': datetime.now().isoformat(),
             'total_players': len(players_data),
-            'source_file': 'ΜΕΓΑ ΛΙΒΑΔΙ FC.xlsx'
+            'source_file': EXCEL_PATH
         },
         'players': players_data
     }
     
     # Write to JSON file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    write_json(output_data, output_path)
     
-    print(f"JSON file created successfully: {output_path}")
-    print(f"Total players processed: {len(players_data)}")
+    log.info("JSON file created successfully: %s", output_path)
+    log.info("Total players processed: %d", len(players_data))
 
-def update_player_json(excel_file_path, json_file_path='players.json'):
+def write_json(data, path):
+    json_writer.write_json(path, data)
+
+def update_player_json(excel_file_path, json_file_path='players.json', sheets=None, matches=None):
     """
-    Update existing JSON file with new data from Excel
+    Update existing JSON file with new data from Excel.
+    Returns the written document, or None if no player data was extracted.
     """
     # Read existing JSON if it exists
     existing_data = {}
@@ -147,15 +173,15 @@ def update_player_json(excel_file_path, json_file_path='players.json'):
         try:
             with open(json_file_path, 'r', encoding='utf-8') as f:
                 existing_data = json.load(f)
-            print(f"Found existing JSON file: {json_file_path}")
+            log.info("Found existing JSON file: %s", json_file_path)
         except Exception as e:
-            print(f"Error reading existing JSON file: {e}")
+            log.error("Error reading existing JSON file: %s", e)
     
-    new_players_data = extract_player_data_from_excel(excel_file_path)
+    new_players_data = extract_player_data_from_excel(excel_file_path, sheets, matches)
     
     if not new_players_data:
-        print("ERROR: No player data extracted from Excel file!")
-        return
+        log.error("ERROR: No player data extracted from Excel file!")
+        return None
     
     # Merge with existing data (preserve existing data if any)
     if 'players' in existing_data:
@@ -165,75 +191,84 @@ def update_player_json(excel_file_path, json_file_path='players.json'):
     else:
         existing_data['players'] = new_players_data
         
-    # Update top performers
+    # Update top performers; only from this run's roster, players.json may
+    # still hold older spellings of the same players
     if existing_data['players']:
-        # Find top scorer (most goals)
-        top_scorer = max(existing_data['players'].items(), key=lambda x: x[1].get('goals', 0))
+        with stage('aggregation'):
+            existing_data['top_performers'] = compute_top_performers(new_players_data)
+            existing_data['derived'] = compute_player_derived(new_players_data)
+        top_scorer = existing_data['top_performers']['top_scorer']
+        top_assister = existing_data['top_performers']['top_assister']
         
-        # Find top assister (most assists)
-        top_assister = max(existing_data['players'].items(), key=lambda x: x[1].get('assists', 0))
-        
-        existing_data['top_performers'] = {
-            'top_scorer': {
-                'name': top_scorer[0],
-                'goals': top_scorer[1].get('goals', 0)
-            },
-            'top_assister': {
-                'name': top_assister[0],
-                'assists': top_assister[1].get('assists', 0)
-            }
-        }
-        
-        print(f"\nTop Scorer: {top_scorer[0]} with {top_scorer[1].get('goals', 0)} goals")
-        print(f"Top Assister: {top_assister[0]} with {top_assister[1].get('assists', 0)} assists")
+        log.info("Top Scorer: %s with %d goals", top_scorer['name'], top_scorer['goals'])
+        log.info("Top Assister: %s with %d assists", top_assister['name'], top_assister['assists'])
     
     # Update metadata
     existing_data['metadata'] = {
         'last_updated': datetime.now().isoformat(),
         'total_players': len(existing_data['players']),
-        'source_file': 'ΜΕΓΑ ΛΙΒΑΔΙ FC.xlsx',
+        'source_file': excel_file_path,
         'previous_update': existing_data.get('metadata', {}).get('last_updated')
     }
     
     # Write updated JSON
-    with open(json_file_path, 'w', encoding='utf-8') as f:
-        json.dump(existing_data, f, ensure_ascii=False, indent=2)
+    write_json(existing_data, json_file_path)
+    
+    log.info("JSON file updated successfully: %s", json_file_path)
+    log.info("Total players: %d", len(existing_data['players']))
+    return existing_data
+
+def log_player_report(data):
+    """Full per-player listing, logged at DEBUG level only"""
+    if not log.isEnabledFor(DEBUG):
+        return
+    log.debug("=" * 80)
+    log.debug("FINAL PLAYER DATA:")
+    log.debug("=" * 80)
+    for player, stats in data['players'].items():
+        log.debug("%s:", player)
+        log.debug("  Position: %s", stats.get('position', 'N/A'))
+        log.debug("  Age: %s", stats.get('age', 'N/A'))
+        log.debug("  Height: %s", stats.get('height', 'N/A'))
+        log.debug("  Jersey: #%s", stats.get('jersey_number', 'N/A'))
+        log.debug("  Stats: APPS=%s, GOALS=%s, ASSISTS=%s, POM=%s",
+                  stats.get('apps', 0), stats.get('goals', 0), stats.get('assists', 0), stats.get('pom', 0))
+        log.debug("-" * 40)
     
-    print(f"JSON file updated successfully: {json_file_path}")
-    print(f"Total players: {len(existing_data['players'])}")
+    log.debug("TOP PERFORMERS:")
+    log.debug("=" * 40)
+    if 'top_performers' in data:
+        log.debug("Top Goalscorer: %s", data['top_performers']['top_scorer']['name'])
+        log.debug("  Goals: %s", data['top_performers']['top_scorer']['goals'])
+        log.debug("Top Assister: %s", data['top_performers']['top_assister']['name'])
+        log.debug("  Assists: %s", data['top_performers']['top_assister']['assists'])
 
 # Main execution
 if __name__ == "__main__":
-    excel_file = "ΜΕΓΑ ΛΙΒΑΔΙ FC.xlsx"
+    parser = argparse.ArgumentParser(description="Update players.json from the club workbook")
+    parser.add_argument('--force', action='store_true', help="rebuild even if nothing changed")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(args.verbose, args.quiet)
+    
+    excel_file = EXCEL_PATH
     json_file = "players.json"
     
     # Check if Excel file exists
     if not os.path.exists(excel_file):
-        print(f"Error: Excel file '{excel_file}' not found!")
+        log.error("Error: Excel file '%s' not found!", excel_file)
         exit(1)
     
+    # Skip the rebuild when neither the workbook nor this code changed
+    if not args.force and step_is_current('players'):
+        log.info("No changes since the last update, %s is up to date (use --force to rebuild)", json_file)
+        exit(0)
+    
     # Update JSON file
-    update_player_json(excel_file, json_file)
-    
-    # Print the final data
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        print("\n" + "="*80)
-        print("FINAL PLAYER DATA:")
-        print("="*80)
-        for player, stats in data['players'].items():
-            print(f"{player}:")
-            print(f"  Position: {stats.get('position', 'N/A')}")
-            print(f"  Age: {stats.get('age', 'N/A')}")
-            print(f"  Height: {stats.get('height', 'N/A')}")
-            print(f"  Jersey: #{stats.get('jersey_number', 'N/A')}")
-            print(f"  Stats: APPS={stats.get('apps', 0)}, GOALS={stats.get('goals', 0)}, ASSISTS={stats.get('assists', 0)}, POM={stats.get('pom', 0)}")
-            print("-" * 40)
-            
-        print("\nTOP PERFORMERS:")
-        print("=" * 40)
-        if 'top_performers' in data:
-            print(f"Top Goalscorer: {data['top_performers']['top_scorer']['name']}")
-            print(f"  Goals: {data['top_performers']['top_scorer']['goals']}")
-            print(f"Top Assister: {data['top_performers']['top_assister']['name']}")
-            print(f"  Assists: {data['top_performers']['top_assister']['assists']}")
\ No newline at end of file
+    data = update_player_json(excel_file, json_file)
+    if data:
+        record_named_step('players')
+        log_player_report(data)
+    
+    if args.profile:
+        write_profile(args.profile, command='player_updater')
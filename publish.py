@@ -0,0 +1,139 @@
+"""
+Publish the site JSON as minified, content-hashed and precompressed files
+
+Usage: python publish.py [-o data] [-v | -q]
+
+Each of site_data.json, players.json, matches.json and league_data.json is
+written to the output directory as '<name>.<hash>.json' plus '.gz' and (when
+the optional `brotli` package is installed) '.br' siblings, so the web server
+can send the precompressed file and cache it forever. manifest.json maps each logical name
+to its current file; the frontend reads it through data_fetch.js and falls
+back to the plain files when there is no manifest.
+
+The per-match `players` lists of matches.json are stored column-wise
+({"number": [...], "name": [...], ...}) instead of repeating every key for
+every player; data_fetch.js turns them back into rows.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+from instrumentation import stage, get_logger, configure_logging, add_logging_arguments, write_profile
+import json_writer
+
+PUBLISH_DIR = 'data'
+MANIFEST_NAME = 'manifest.json'
+SOURCES = ['site_data.json', 'players.json', 'matches.json', 'league_data.json']
+PLAYER_COLUMNS = ['number', 'name', 'position', 'goals', 'assists']
+
+log = get_logger('publish')
+
+def columnar_players(document):
+    """matches.json with each match's players as {column: [values]}"""
+    matches = []
+    for match in document.get('matches', []):
+        match = dict(match)
+        match['players'] = {column: [player.get(column) for player in match['players']]
+                            for column in PLAYER_COLUMNS}
+        matches.append(match)
+    encoded = dict(document)
+    encoded['matches'] = matches
+    encoded['encoding'] = {'players': 'columnar'}
+    return encoded
+
+def minify(data):
+    return json_writer.dumps(data, indent=None)
+
+def content_hash(payload):
+    return hashlib.sha256(payload).hexdigest()[:10]
+
+def compressors():
+    """{suffix: compress function} for every compression available here"""
+    available = {'.gz': lambda payload: gzip.compress(payload, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        log.debug("brotli not installed, skipping .br files")
+    else:
+        available['.br'] = lambda payload: brotli.compress(payload, quality=11)
+    return available
+
+def compressed_variants(payload, suffixes=None):
+    """{suffix: bytes} for `suffixes` (default: every compression available here)"""
+    available = compressors()
+    return {suffix: compress(payload) for suffix, compress in available.items()
+            if suffixes is None or suffix in suffixes}
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def publish(sources=SOURCES, output_dir=PUBLISH_DIR):
+    """
+    Write the hashed/compressed copies of `sources` and the manifest; returns
+    the manifest. Files of the previous manifest that are no longer current
+    are removed.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    previous = load_manifest(output_dir)
+    manifest = {}
+    suffixes = list(compressors())
+
+    for source in sources:
+        with open(source, encoding='utf-8') as f:
+            data = json.load(f)
+        with stage('serialization'):
+            if source == 'matches.json':
+                data = columnar_players(data)
+            payload = minify(data)
+        stem = os.path.splitext(os.path.basename(source))[0]
+        name = f"{stem}.{content_hash(payload)}.json"
+        path = os.path.join(output_dir, name)
+
+        # a hashed name never changes content, so each existing variant is
+        # current; only the missing ones (say .br after installing brotli) are made
+        missing = [suffix for suffix in suffixes if not os.path.exists(path + suffix)]
+        with stage('compression'):
+            variants = compressed_variants(payload, missing)
+        with stage('write'):
+            if not os.path.exists(path):
+                json_writer.write_bytes(path, payload)
+            for suffix, blob in variants.items():
+                json_writer.write_bytes(path + suffix, blob)
+
+        manifest[os.path.basename(source)] = {
+            'file': name,
+            'bytes': len(payload),
+            **{suffix.lstrip('.'): os.path.getsize(path + suffix) for suffix in suffixes}
+        }
+        log.info("📦 %s -> %s (%s)", source, name,
+                 ', '.join(f"{key} {size:,} B" for key, size in manifest[os.path.basename(source)].items() if key != 'file'))
+
+    # written last, so it never points at a file that is not there yet
+    json_writer.write_json(os.path.join(output_dir, MANIFEST_NAME), manifest)
+
+    current = {entry['file'] for entry in manifest.values()}
+    for entry in previous.values():
+        if entry.get('file') not in current:
+            for suffix in ('', '.gz', '.br'):
+                stale = os.path.join(output_dir, entry['file'] + suffix)
+                if os.path.exists(stale):
+                    os.remove(stale)
+    return manifest
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write minified, hashed and precompressed copies of the site JSON")
+    parser.add_argument('-o', '--output-dir', default=PUBLISH_DIR)
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(args.verbose, args.quiet)
+
+    publish(output_dir=args.output_dir)
+    if args.profile:
+        write_profile(args.profile, command='publish')
@@ -2,12 +2,20 @@
 // Load match data from JSON
 async function loadMatchData() {
     try {
-        const response = await fetch('matches.json');
+        // The sharded index (matches/, rewritten with matches.json by
+        // update_all and watch) has everything the list shows
+        const [index, imageMap] = await Promise.all([fetchData('matches/index.json'), loadImageMap()]);
+        if (index.ok) {
+            displayMatches((await index.json()).matches, imageMap);
+            return;
+        }
+        
+        const response = await fetchData('matches.json');
         if (!response.ok) {
             throw new Error('Failed to load match data');
         }
         const data = await response.json();
-        displayMatches(data.matches);
+        displayMatches(data.matches, imageMap);
     } catch (error) {
         console.error('Error loading match data:', error);
         document.getElementById('matches-container').innerHTML = 
@@ -15,8 +23,8 @@ async function loadMatchData() {
     }
 }
 
-// Display matches from JSON data
-function displayMatches(matches) {
+// Display matches from JSON data; badges use the thumbnails of `imageMap` (assets/images.json)
+function displayMatches(matches, imageMap) {
     const container = document.getElementById('matches-container');
     container.innerHTML = '';
     
@@ -129,6 +137,9 @@ function displayMatches(matches) {
     // Sort matches by date (newest first)
     matches.sort((a, b) => new Date(b.date) - new Date(a.date));
     
+    const ourBadge = logoAttributes(imageMap, 'logo_mg-1.png', 50);
+    const opponentBadge = logoAttributes(imageMap, 'club_placeholder.png', 50);
+    
     matches.forEach(match => {
         const accordion = document.createElement('div');
         accordion.className = 'accordion';
@@ -175,13 +186,13 @@ function displayMatches(matches) {
             // Home match: Μεγάλο Λειβάδι vs Opponent
             team1 = `
                 <div class="team">
-                    <img src="logo_mg-1.png" alt="Μεγάλο Λειβάδι FC" class="team-badge">
+                    <img ${ourBadge} alt="Μεγάλο Λειβάδι FC" class="team-badge">
                     <div class="team-name">Μεγάλο Λειβάδι FC</div>
                 </div>
             `;
             team2 = `
                 <div class="team">
-                    <img src="club_placeholder.png" alt="${match.opponent}" class="team-badge">
+                    <img ${opponentBadge} alt="${match.opponent}" class="team-badge">
                     <div class="team-name">${match.opponent}</div>
                 </div>
             `;
@@ -189,13 +200,13 @@ function displayMatches(matches) {
             // Away match: Opponent vs Μεγάλο Λειβάδι
             team1 = `
                 <div class="team">
-                    <img src="club_placeholder.png" alt="${match.opponent}" class="team-badge">
+                    <img ${opponentBadge} alt="${match.opponent}" class="team-badge">
                     <div class="team-name">${match.opponent}</div>
                 </div>
             `;
             team2 = `
                 <div class="team">
-                    <img src="logo_mg-1.png" alt="Μεγάλο Λειβάδι FC" class="team-badge">
+                    <img ${ourBadge} alt="Μεγάλο Λειβάδι FC" class="team-badge">
                     <div class="team-name">Μεγάλο Λειβάδι FC</div>
                 </div>
             `;
@@ -229,244 +240,281 @@ function displayMatches(matches) {
         locationInfo.innerHTML = `<strong>Location:</strong> ${match.location} match`;
         content.appendChild(locationInfo);
 
-        // Create lineup display
-        const lineupHeader = document.createElement('div');
-        lineupHeader.className = 'stats-header';
-        lineupHeader.textContent = 'Starting Lineup';
-        content.appendChild(lineupHeader);
-
-        // Separate starting players and bench players
-        const startingPlayers = match.players.filter(player => 
-            player.position && player.position !== 'Bench'
-        );
-
-        const benchPlayers = match.players.filter(player => 
-            player.position && player.position === 'Bench'
-        );
-
-        // Create football pitch container
-        const pitchContainer = document.createElement('div');
-        pitchContainer.className = 'pitch-container';
-
-        // Add pitch markings
-        const centerCircle = document.createElement('div');
-        centerCircle.style.position = 'absolute';
-        centerCircle.style.top = '50%';
-        centerCircle.style.left = '50%';
-        centerCircle.style.transform = 'translate(-50%, -50%)';
-        centerCircle.style.width = '100px';
-        centerCircle.style.height = '100px';
-        centerCircle.style.border = '2px solid #fff';
-        centerCircle.style.borderRadius = '50%';
-        centerCircle.style.backgroundColor = 'transparent';
-        centerCircle.style.zIndex = '1';
-        pitchContainer.appendChild(centerCircle);
-
-        const centerLine = document.createElement('div');
-        centerLine.style.position = 'absolute';
-        centerLine.style.top = '50%';
-        centerLine.style.left = '50%';
-        centerLine.style.transform = 'translateX(-50%)';
-        centerLine.style.width = '100%';
-        centerLine.style.height = '2px';
-        centerLine.style.backgroundColor = '#fff';
-        centerLine.style.zIndex = '1';
-        pitchContainer.appendChild(centerLine);
-
-        // Group players by position for better distribution
-        const playersByPosition = {
-            'Goalkeeper': [],
-            'Defender': [],
-            'Midfielder': [], 
-            'Striker': []
-        };
-
-        // Group starting players
-        startingPlayers.forEach(player => {
-            const pos = player.position;
-            if (pos === 'Goalkeeper') {
-                playersByPosition.Goalkeeper.push(player);
-            } else if (pos.includes('Defender') || pos === 'Defernder' || pos === 'Defenedr') {
-                playersByPosition.Defender.push(player);
-            } else if (pos === 'Midfielder') {
-                playersByPosition.Midfielder.push(player);
-            } else if (pos === 'Striker') {
-                playersByPosition.Striker.push(player);
-            }
-        });
-
-        // Define formation positions for proper distribution
-        const formationPositions = {
-            'Goalkeeper': [
-                { top: '90%', left: '50%', posAbbr: 'GK' }
-            ],
-            'Defender': [
-                { top: '60%', left: '25%', posAbbr: 'CB' },
-                { top: '70%', left: '50%', posAbbr: 'CB' },
-                { top: '60%', left: '75%', posAbbr: 'CB' }
-            ],
-            'Midfielder': [
-                { top: '30%', left: '25%', posAbbr: 'LM' },
-                { top: '40%', left: '50%', posAbbr: 'CM' },
-                { top: '30%', left: '75%', posAbbr: 'RM' }
-            ],
-            'Striker': [
-                { top: '8%', left: '50%', posAbbr: 'ST' }
-            ]
-        };
+        if (match.players) {
+            renderLineup(content, match);
+        } else {
+            // Sharded output: the player lines are fetched the first time the match is opened
+            const onOpen = async () => {
+                header.removeEventListener('click', onOpen);
+                if (!await loadMatchDetail(content, match)) {
+                    header.addEventListener('click', onOpen);  // try again on the next click
+                }
+            };
+            header.addEventListener('click', onOpen);
+        }
+        
+        // Assemble accordion
+        accordion.appendChild(header);
+        accordion.appendChild(content);
+        container.appendChild(accordion);
+    });
+    
+    // Reattach accordion toggle functionality
+    attachAccordionToggle();
+}
 
-        // Function to create player stats symbols
-        function createStatsSymbols(player, match) {
-            const cleanName = player.name ? player.name.replace(' (C)', '').replace(' (Τ)', '').replace(' (Π)', '') : 'Unknown';
-            const isPOM = match.player_of_match && cleanName && 
-                (match.player_of_match.includes(cleanName) || cleanName.includes(match.player_of_match));
-            
-            const goals = player.goals || 0;
-            const assists = player.assists || 0;
-            const hasGoals = goals > 0;
-            const hasAssists = assists > 0;
+// Fetch the player lines of a match listed in the sharded index; returns
+// whether the lineup was shown
+async function loadMatchDetail(content, match) {
+    const error = content.querySelector('.lineup-error');
+    if (error) error.remove();
+    try {
+        const response = await fetchData(`matches/${match.detail}`);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const detail = await response.json();
+        match.players = detail.players;
+        renderLineup(content, match);
+        return true;
+    } catch (error) {
+        console.error('Error loading match detail:', error);
+        content.insertAdjacentHTML('beforeend', '<div class="loading lineup-error">Error loading the lineup. Please try again later.</div>');
+        return false;
+    }
+}
 
-            let goalSymbols = '';
-            let assistSymbols = '';
+// Pitch, formation and bench for one match
+function renderLineup(content, match) {
+    // Create lineup display
+    const lineupHeader = document.createElement('div');
+    lineupHeader.className = 'stats-header';
+    lineupHeader.textContent = 'Starting Lineup';
+    content.appendChild(lineupHeader);
+
+    // Separate starting players and bench players
+    const startingPlayers = match.players.filter(player => 
+        player.position && player.position !== 'Bench'
+    );
+
+    const benchPlayers = match.players.filter(player => 
+        player.position && player.position === 'Bench'
+    );
+
+    // Create football pitch container
+    const pitchContainer = document.createElement('div');
+    pitchContainer.className = 'pitch-container';
+
+    // Add pitch markings
+    const centerCircle = document.createElement('div');
+    centerCircle.style.position = 'absolute';
+    centerCircle.style.top = '50%';
+    centerCircle.style.left = '50%';
+    centerCircle.style.transform = 'translate(-50%, -50%)';
+    centerCircle.style.width = '100px';
+    centerCircle.style.height = '100px';
+    centerCircle.style.border = '2px solid #fff';
+    centerCircle.style.borderRadius = '50%';
+    centerCircle.style.backgroundColor = 'transparent';
+    centerCircle.style.zIndex = '1';
+    pitchContainer.appendChild(centerCircle);
+
+    const centerLine = document.createElement('div');
+    centerLine.style.position = 'absolute';
+    centerLine.style.top = '50%';
+    centerLine.style.left = '50%';
+    centerLine.style.transform = 'translateX(-50%)';
+    centerLine.style.width = '100%';
+    centerLine.style.height = '2px';
+    centerLine.style.backgroundColor = '#fff';
+    centerLine.style.zIndex = '1';
+    pitchContainer.appendChild(centerLine);
+
+    // Group players by position for better distribution
+    const playersByPosition = {
+        'Goalkeeper': [],
+        'Defender': [],
+        'Midfielder': [], 
+        'Striker': []
+    };
+
+    // Group starting players
+    startingPlayers.forEach(player => {
+        const pos = player.position;
+        if (pos === 'Goalkeeper') {
+            playersByPosition.Goalkeeper.push(player);
+        } else if (pos.includes('Defender') || pos === 'Defernder' || pos === 'Defenedr') {
+            playersByPosition.Defender.push(player);
+        } else if (pos === 'Midfielder') {
+            playersByPosition.Midfielder.push(player);
+        } else if (pos === 'Striker') {
+            playersByPosition.Striker.push(player);
+        }
+    });
 
-            if (hasGoals) {
-                goalSymbols = '⚽'.repeat(goals);
-            }
+    // Define formation positions for proper distribution
+    const formationPositions = {
+        'Goalkeeper': [
+            { top: '90%', left: '50%', posAbbr: 'GK' }
+        ],
+        'Defender': [
+            { top: '60%', left: '25%', posAbbr: 'CB' },
+            { top: '70%', left: '50%', posAbbr: 'CB' },
+            { top: '60%', left: '75%', posAbbr: 'CB' }
+        ],
+        'Midfielder': [
+            { top: '30%', left: '25%', posAbbr: 'LM' },
+            { top: '40%', left: '50%', posAbbr: 'CM' },
+            { top: '30%', left: '75%', posAbbr: 'RM' }
+        ],
+        'Striker': [
+            { top: '8%', left: '50%', posAbbr: 'ST' }
+        ]
+    };
+
+    // Function to create player stats symbols
+    function createStatsSymbols(player, match) {
+        const cleanName = player.name ? player.name.replace(' (C)', '').replace(' (Τ)', '').replace(' (Π)', '') : 'Unknown';
+        const isPOM = match.player_of_match && cleanName && 
+            (match.player_of_match.includes(cleanName) || cleanName.includes(match.player_of_match));
+        
+        const goals = player.goals || 0;
+        const assists = player.assists || 0;
+        const hasGoals = goals > 0;
+        const hasAssists = assists > 0;
 
-            if (hasAssists) {
-                assistSymbols = '👟'.repeat(assists);
-            }
+        let goalSymbols = '';
+        let assistSymbols = '';
 
-            return {
-                goalSymbols,
-                assistSymbols,
-                isPOM,
-                goals,
-                assists,
-                cleanName
-            };
+        if (hasGoals) {
+            goalSymbols = '⚽'.repeat(goals);
         }
 
-        // Place starting players on pitch
-        Object.keys(playersByPosition).forEach(positionType => {
-            const players = playersByPosition[positionType];
-            const positions = formationPositions[positionType] || [];
-            
-            players.forEach((player, index) => {
-                if (index < positions.length) {
-                    const pos = positions[index];
-                    const playerElement = document.createElement('div');
-                    playerElement.className = 'player-on-pitch';
-                    playerElement.style.top = pos.top;
-                    playerElement.style.left = pos.left;
-
-                    // Get player number safely (allow 0 as valid number)
-                    const playerNumber = player.number != null ? player.number : '?';
-
-                    // Use first name only for display
-                    const displayName = player.name ? player.name.split(' ')[0] : 'Player';
-
-                    // Create stats symbols
-                    const stats = createStatsSymbols(player, match);
-
-                    playerElement.innerHTML = `
-                        <div style="font-size: 12px; font-weight: bold; margin-bottom: 2px;">${playerNumber}</div>
-                        <div style="font-size: 10px; line-height: 1.1;">${displayName}</div>
-                        <div style="font-size: 9px; margin-top: 2px; color: #ffeb3b;">${pos.posAbbr}</div>
-                        <div class="stats-symbols">
-                            ${stats.goalSymbols ? `<div style="color: #27ae60;" title="${stats.goals} goal${stats.goals > 1 ? 's' : ''}">${stats.goalSymbols}</div>` : ''}
-                            ${stats.assistSymbols ? `<div style="color: #3498db;" title="${stats.assists} assist${stats.assists > 1 ? 's' : ''}">${stats.assistSymbols}</div>` : ''}
-                            ${stats.isPOM ? '<div style="color: gold;" title="Player of the Match">⭐</div>' : ''}
-                        </div>
-                    `;
-
-                    // Add hover tooltip with detailed stats
-                    const tooltipStats = [];
-                    if (stats.goals > 0) tooltipStats.push(`Goals: ${stats.goals}`);
-                    if (stats.assists > 0) tooltipStats.push(`Assists: ${stats.assists}`);
-                    if (stats.isPOM) tooltipStats.push('⭐ Player of the Match');
-
-                    playerElement.title = `${stats.cleanName} (#${playerNumber}) - ${pos.posAbbr}${tooltipStats.length ? '\n' + tooltipStats.join('\n') : ''}`;
-
-                    pitchContainer.appendChild(playerElement);
-                }
-            });
-        });
+        if (hasAssists) {
+            assistSymbols = '👟'.repeat(assists);
+        }
 
-        content.appendChild(pitchContainer);
+        return {
+            goalSymbols,
+            assistSymbols,
+            isPOM,
+            goals,
+            assists,
+            cleanName
+        };
+    }
 
-        // Add formation info
-        const formationInfo = document.createElement('div');
-        formationInfo.style.textAlign = 'center';
-        formationInfo.style.marginTop = '15px';
-        formationInfo.style.fontSize = '0.9rem';
-        formationInfo.style.color = '#333';
-        formationInfo.innerHTML = `
-            <div><strong>Formation: ${playersByPosition.Defender.length}-${playersByPosition.Midfielder.length}-${playersByPosition.Striker.length}</strong></div>
-        `;
-        content.appendChild(formationInfo);
+    // Place starting players on pitch
+    Object.keys(playersByPosition).forEach(positionType => {
+        const players = playersByPosition[positionType];
+        const positions = formationPositions[positionType] || [];
+        
+        players.forEach((player, index) => {
+            if (index < positions.length) {
+                const pos = positions[index];
+                const playerElement = document.createElement('div');
+                playerElement.className = 'player-on-pitch';
+                playerElement.style.top = pos.top;
+                playerElement.style.left = pos.left;
 
-        // Add bench players section
-        if (benchPlayers.length > 0) {
-            const benchContainer = document.createElement('div');
-            benchContainer.className = 'bench-container';
-            
-            const benchTitle = document.createElement('div');
-            benchTitle.className = 'bench-title';
-            benchTitle.textContent = `Bench (${benchPlayers.length})`;
-            benchContainer.appendChild(benchTitle);
-
-            const benchPlayersContainer = document.createElement('div');
-            benchPlayersContainer.className = 'bench-players';
-
-            benchPlayers.forEach(player => {
-                const benchPlayerElement = document.createElement('div');
-                benchPlayerElement.className = 'bench-player';
-                
                 // Get player number safely (allow 0 as valid number)
                 const playerNumber = player.number != null ? player.number : '?';
-                
-                // Clean name
-                const cleanName = player.name ? player.name.replace(' (C)', '').replace(' (Τ)', '').replace(' (Π)', '') : 'Unknown';
-                
+
+                // Use first name only for display
+                const displayName = player.name ? player.name.split(' ')[0] : 'Player';
+
                 // Create stats symbols
                 const stats = createStatsSymbols(player, match);
 
-                benchPlayerElement.innerHTML = `
-                    <div class="bench-player-number">#${playerNumber}</div>
-                    <div class="bench-player-name">${cleanName}</div>
-                    ${(stats.goalSymbols || stats.assistSymbols || stats.isPOM) ? `
-                        <div class="bench-stats-symbols">
-                            ${stats.goalSymbols ? `<div style="color: #27ae60;" title="${stats.goals} goal${stats.goals > 1 ? 's' : ''}">${stats.goalSymbols}</div>` : ''}
-                            ${stats.assistSymbols ? `<div style="color: #3498db;" title="${stats.assists} assist${stats.assists > 1 ? 's' : ''}">${stats.assistSymbols}</div>` : ''}
-                            ${stats.isPOM ? '<div style="color: gold;" title="Player of the Match">⭐</div>' : ''}
-                        </div>
-                    ` : ''}
+                playerElement.innerHTML = `
+                    <div style="font-size: 12px; font-weight: bold; margin-bottom: 2px;">${playerNumber}</div>
+                    <div style="font-size: 10px; line-height: 1.1;">${displayName}</div>
+                    <div style="font-size: 9px; margin-top: 2px; color: #ffeb3b;">${pos.posAbbr}</div>
+                    <div class="stats-symbols">
+                        ${stats.goalSymbols ? `<div style="color: #27ae60;" title="${stats.goals} goal${stats.goals > 1 ? 's' : ''}">${stats.goalSymbols}</div>` : ''}
+                        ${stats.assistSymbols ? `<div style="color: #3498db;" title="${stats.assists} assist${stats.assists > 1 ? 's' : ''}">${stats.assistSymbols}</div>` : ''}
+                        ${stats.isPOM ? '<div style="color: gold;" title="Player of the Match">⭐</div>' : ''}
+                    </div>
                 `;
 
-                // Add hover tooltip
+                // Add hover tooltip with detailed stats
                 const tooltipStats = [];
                 if (stats.goals > 0) tooltipStats.push(`Goals: ${stats.goals}`);
                 if (stats.assists > 0) tooltipStats.push(`Assists: ${stats.assists}`);
                 if (stats.isPOM) tooltipStats.push('⭐ Player of the Match');
 
-                benchPlayerElement.title = `${cleanName} (#${playerNumber}) - Bench${tooltipStats.length ? '\n' + tooltipStats.join('\n') : ''}`;
+                playerElement.title = `${stats.cleanName} (#${playerNumber}) - ${pos.posAbbr}${tooltipStats.length ? '\n' + tooltipStats.join('\n') : ''}`;
 
-                benchPlayersContainer.appendChild(benchPlayerElement);
-            });
+                pitchContainer.appendChild(playerElement);
+            }
+        });
+    });
 
-            benchContainer.appendChild(benchPlayersContainer);
-            content.appendChild(benchContainer);
-        }
+    content.appendChild(pitchContainer);
+
+    // Add formation info
+    const formationInfo = document.createElement('div');
+    formationInfo.style.textAlign = 'center';
+    formationInfo.style.marginTop = '15px';
+    formationInfo.style.fontSize = '0.9rem';
+    formationInfo.style.color = '#333';
+    formationInfo.innerHTML = `
+        <div><strong>Formation: ${playersByPosition.Defender.length}-${playersByPosition.Midfielder.length}-${playersByPosition.Striker.length}</strong></div>
+    `;
+    content.appendChild(formationInfo);
+
+    // Add bench players section
+    if (benchPlayers.length > 0) {
+        const benchContainer = document.createElement('div');
+        benchContainer.className = 'bench-container';
         
-        // Assemble accordion
-        accordion.appendChild(header);
-        accordion.appendChild(content);
-        container.appendChild(accordion);
-    });
-    
-    // Reattach accordion toggle functionality
-    attachAccordionToggle();
+        const benchTitle = document.createElement('div');
+        benchTitle.className = 'bench-title';
+        benchTitle.textContent = `Bench (${benchPlayers.length})`;
+        benchContainer.appendChild(benchTitle);
+
+        const benchPlayersContainer = document.createElement('div');
+        benchPlayersContainer.className = 'bench-players';
+
+        benchPlayers.forEach(player => {
+            const benchPlayerElement = document.createElement('div');
+            benchPlayerElement.className = 'bench-player';
+            
+            // Get player number safely (allow 0 as valid number)
+            const playerNumber = player.number != null ? player.number : '?';
+            
+            // Clean name
+            const cleanName = player.name ? player.name.replace(' (C)', '').replace(' (Τ)', '').replace(' (Π)', '') : 'Unknown';
+            
+            // Create stats symbols
+            const stats = createStatsSymbols(player, match);
+
+            benchPlayerElement.innerHTML = `
+                <div class="bench-player-number">#${playerNumber}</div>
+                <div class="bench-player-name">${cleanName}</div>
+                ${(stats.goalSymbols || stats.assistSymbols || stats.isPOM) ? `
+                    <div class="bench-stats-symbols">
+                        ${stats.goalSymbols ? `<div style="color: #27ae60;" title="${stats.goals} goal${stats.goals > 1 ? 's' : ''}">${stats.goalSymbols}</div>` : ''}
+                        ${stats.assistSymbols ? `<div style="color: #3498db;" title="${stats.assists} assist${stats.assists > 1 ? 's' : ''}">${stats.assistSymbols}</div>` : ''}
+                        ${stats.isPOM ? '<div style="color: gold;" title="Player of the Match">⭐</div>' : ''}
+                    </div>
+                ` : ''}
+            `;
+
+            // Add hover tooltip
+            const tooltipStats = [];
+            if (stats.goals > 0) tooltipStats.push(`Goals: ${stats.goals}`);
+            if (stats.assists > 0) tooltipStats.push(`Assists: ${stats.assists}`);
+            if (stats.isPOM) tooltipStats.push('⭐ Player of the Match');
+
+            benchPlayerElement.title = `${cleanName} (#${playerNumber}) - Bench${tooltipStats.length ? '\n' + tooltipStats.join('\n') : ''}`;
+
+            benchPlayersContainer.appendChild(benchPlayerElement);
+        });
+
+        benchContainer.appendChild(benchPlayersContainer);
+        content.appendChild(benchContainer);
+    }
 }
 
 // Attach accordion toggle functionality
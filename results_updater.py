@@ -1,45 +1,78 @@
 # results_updater.py
 # Reads "ΜΕΓΑ ΛΙΒΑΔΙ FC.xlsx" (sheet "Φύλλο2") and writes matches JSON.
 # NO try/except blocks (per user's request).
+#
+# Importable: parse_matches(df) turns an in-memory sheet into match dicts and
+# build_matches_document(...) wraps them with metadata/summary/derived stats
+# (form, home/away splits, POM per opponent). Running the
+# file keeps the old behaviour and also accepts several workbooks at once:
+#   python results_updater.py [workbook ...] [-o matches.json] [--output-dir DIR]
+# --incremental keeps a per-block fingerprint cache (matches.cache.json) and
+# only re-parses match blocks that are new or changed. Workbooks whose inputs
+# and output match the build manifest are skipped unless --force is given.
+# pandas/numpy are imported inside the parsing functions, so --help and
+# skipped runs never pay for them. --stream reads the sheet through openpyxl's
+# read-only row iterator (iter_matches) instead of a whole-sheet DataFrame.
+# Per-match lines are logged at DEBUG (-v); --profile writes stage timings.
+# --shards [DIR] also writes DIR/index.json (no player lines) plus one
+# match-<id>.json detail file per match, which results.js fetches only when a
+# match is opened. update_all, watch and a plain run for the default workbook
+# always write them to matches/, so the index never goes stale. The default
+# workbook shares the 'matches' build manifest step with update_all.
 
-import pandas as pd, re, json
+import re, json, os, argparse
+from collections import deque
 from datetime import datetime
+from workbook_loader import load_sheets, EXCEL_PATH, MATCH_SHEET
+from build_manifest import STEPS, is_up_to_date, record_step, step_inputs
+from partitions import configured_season
+from instrumentation import stage, get_logger, configure_logging, add_logging_arguments, write_profile
+import json_writer
 
-EXCEL_PATH = "ΜΕΓΑ ΛΙΒΑΔΙ FC.xlsx"
-SHEET_NAME = "Φύλλο2"
+SHEET_NAME = MATCH_SHEET
 OUTPUT_JSON = "matches.json"
+CACHE_VERSION = 2  # bump when parse_match_block output changes
+FORM_LENGTH = 5  # matches in the "form" block
+SHARD_DIR = "matches"  # --shards: index.json + one match-<match id>.json per match
+SHARD_INDEX = "index.json"
+SHARD_PREFIX = "match-"
 
-df = pd.read_excel(EXCEL_PATH, sheet_name=SHEET_NAME, header=None)
-nrows, ncols = df.shape
+log = get_logger("results")
 
-def find_date_row_above(row_idx, max_lookback=10):
-    for r in range(row_idx-1, max(-1, row_idx - max_lookback - 1), -1):
-        c0 = df.iat[r,0]
-        if not pd.isna(c0) and str(c0).strip().lower() == "date":
-            # Look for location (Home/Away) in this Date row
-            location = "Home"  # default
-            for c in range(ncols):
-                v = df.iat[r, c]
-                if not pd.isna(v):
-                    vs = str(v).strip().lower()
-                    if vs == "home":
-                        location = "Home"
-                    elif vs == "away":
-                        location = "Away"
-            
-            # Find the actual date
+def find_date_row_above(df, date_rows):
+    """
+    Read date and Home/Away from the nearest 'Date' marker row above a match.
+    `date_rows` are the candidate marker rows, nearest first (see segment_blocks).
+    """
+    import pandas as pd
+    nrows, ncols = df.shape
+    for r in date_rows:
+        # Look for location (Home/Away) in this Date row
+        location = "Home"  # default
+        for c in range(ncols):
+            v = df.iat[r, c]
+            if not pd.isna(v):
+                vs = str(v).strip().lower()
+                if vs == "home":
+                    location = "Home"
+                elif vs == "away":
+                    location = "Away"
+
+        # Find the actual date
+        for c in range(ncols):
+            v = df.iat[r, c]
+            if isinstance(v, (pd.Timestamp, datetime)):
+                return v, r, c, location
+        if r+1 < nrows:
             for c in range(ncols):
-                v = df.iat[r, c]
+                v = df.iat[r+1, c]
                 if isinstance(v, (pd.Timestamp, datetime)):
-                    return v, r, c, location
-            if r+1 < nrows:
-                for c in range(ncols):
-                    v = df.iat[r+1, c]
-                    if isinstance(v, (pd.Timestamp, datetime)):
-                        return v, r+1, c, location
+                    return v, r+1, c, location
     return None, None, None, "Home"  # default to Home if not found
 
-def find_nearest_date_above(row_idx, max_lookback=10):
+def find_nearest_date_above(df, row_idx, max_lookback=10):
+    import pandas as pd
+    ncols = df.shape[1]
     for r in range(row_idx, max(-1, row_idx - max_lookback) , -1):
         for c in range(ncols):
             v = df.iat[r, c]
@@ -47,242 +80,449 @@ def find_nearest_date_above(row_idx, max_lookback=10):
                 return v, r, c
     return None, None, None
 
-def find_score_near(row_idx, max_up=8, max_down=3):
+SCORE_PATTERN = r"\b(\d{1,2})\s*[-–]\s*(\d{1,2})\b"
+YEAR_MONTH_PATTERN = r"20\d{2}[-/]\d{1,2}"
+
+def build_score_index(df):
     """
-    Look around a 'Match' row for a valid score like '3-2' or '0–5'.
-    Skips NaN and non-numeric pairs, avoiding mistaken matches like '2025-03'.
+    Find every score-like cell ('3-2', '0–5') of the sheet in one vectorised pass.
+    NaN and date cells are skipped, as are year-month strings like '2025-03'.
+    Returns row/col arrays sorted by row then column, plus the score strings.
     """
-    pattern = re.compile(r"\b(\d{1,2})\s*[-–]\s*(\d{1,2})\b")
-    for r in range(max(row_idx - max_up, 0), min(row_idx + max_down + 1, nrows)):
-        for c in range(ncols):
-            val = df.iat[r, c]
-            if pd.isna(val) or isinstance(val, (pd.Timestamp, datetime)):
-                continue
-            s = str(val).strip()
-            # skip year-month patterns
-            if re.match(r"20\d{2}[-/]\d{1,2}", s):
-                continue
-            m = pattern.search(s)
-            if m:
-                home, away = int(m.group(1)), int(m.group(2))
-                # sanity check: valid football scores only
-                if 0 <= home <= 20 and 0 <= away <= 20:
-                    return f"{home}-{away}", r, c
+    import pandas as pd
+    ncols = df.shape[1]
+    cells = pd.Series(df.to_numpy(dtype=object).ravel())
+    keep = cells.notna() & ~cells.map(lambda v: isinstance(v, (pd.Timestamp, datetime)))
+    # object dtype keeps the regexes on Python's re (Unicode-aware \b)
+    text = cells[keep].astype(str).astype(object).str.strip()
+    text = text[~text.str.match(YEAR_MONTH_PATTERN)]
+    found = text.str.extract(SCORE_PATTERN).dropna().astype(int)
+    # sanity check: valid football scores only
+    found = found[(found[0] <= 20) & (found[1] <= 20)]
+    flat = found.index.to_numpy()
+    return {
+        "rows": flat // ncols,
+        "cols": flat % ncols,
+        "scores": [f"{home}-{away}" for home, away in zip(found[0], found[1])]
+    }
+
+def find_score_near(score_index, nrows, row_idx, max_up=8, max_down=3):
+    """
+    Look around a 'Match' row for a valid score in the precomputed score index.
+    Returns the first one by row then column, like a top-down scan of the window.
+    """
+    import numpy as np
+    rows = score_index["rows"]
+    k = np.searchsorted(rows, max(row_idx - max_up, 0), side="left")
+    if k < len(rows) and rows[k] < min(row_idx + max_down + 1, nrows):
+        return score_index["scores"][k], int(rows[k]), int(score_index["cols"][k])
     return None, None, None
 
+def marker_column(df):
+    """Column 0 as stripped, lower-cased strings ('' for empty cells)"""
+    col0 = df[0]
+    return col0.where(col0.notna(), "").astype(str).str.strip().str.lower()
+
+def segment_blocks(df, max_lookback=10):
+    """
+    Locate every match block with one vectorised pass over column 0.
+
+    Returns one dict per 'Match' row with the row indices the field extractors
+    need: candidate 'Date' rows above it (nearest first), the 'Stats' header,
+    the end of the player rows and the 'Player of the Match' row.
+    """
+    import numpy as np
+    nrows = df.shape[0]
+    markers = marker_column(df)
+    date_rows = np.flatnonzero((markers == "date").to_numpy())
+    match_rows = np.flatnonzero((markers == "match").to_numpy())
+    stats_rows = np.flatnonzero((markers == "stats").to_numpy())
+    pom_rows = np.flatnonzero(markers.str.startswith("player of the match").to_numpy())
+    boundaries = np.union1d(date_rows, match_rows)
+
+    blocks = []
+    for i in match_rows:
+        i = int(i)
+        b = np.searchsorted(boundaries, i, side="right")
+        next_boundary = int(boundaries[b]) if b < len(boundaries) else nrows
+
+        lo = np.searchsorted(date_rows, i - max_lookback, side="left")
+        hi = np.searchsorted(date_rows, i, side="left")
+        dates_above = [int(r) for r in date_rows[lo:hi][::-1]]
 
-matches = []
-
-for i in range(nrows):
-    first = df.iat[i, 0] if not pd.isna(df.iat[i, 0]) else ""
-    first_str = str(first).strip().lower() if first is not None else ""
-    if first_str == "match":
-        row = df.iloc[i]
-        opponent = ""
-        outcome = None
-        match_date = None
-        location = "Home"  # Default to home
-        
-        # Get date AND location from the Date row above
-        match_date, drow, dcol, location = find_date_row_above(i, max_lookback=10)
-        
-        if match_date is None:
-            for c in range(ncols):
-                if isinstance(df.iat[i, c], (pd.Timestamp, datetime)):
-                    match_date = df.iat[i, c]
-                    break
-        if match_date is None:
-            match_date, drow, dcol = find_nearest_date_above(i, max_lookback=10)
-        
-        # Find opponent in the Match row
-        for c in range(ncols):
-            cell = row[c]
-            if pd.isna(cell):
-                continue
-            s = str(cell).strip()
-            if s.upper() in ("W","L","D"):
-                outcome = s.upper()
-            if "vs" in s.lower():
-                idx = s.lower().find("vs")
-                opponent_candidate = s[idx+2:].strip()
-                opponent = opponent_candidate.strip(" :.-")
-        
-        # find explicit score nearby
-        result, score_row, score_col = find_score_near(i, max_up=8, max_down=3)
-        
-        # # Adjust score order based on home/away
-        # if result and location == "Away":
-        #     # For away matches, swap the score to show opponent first
-        #     home_goals, away_goals = result.split('-')
-        #     result = f"{home_goals}-{away_goals}"
-        
-        # parse player block
         stats_idx = None
-        j = i + 1
-        while j < nrows:
-            cell0 = df.iat[j, 0]
-            if not pd.isna(cell0) and str(cell0).strip().lower() == "stats":
-                stats_idx = j
-                break
-            if not pd.isna(cell0) and str(cell0).strip().lower() in ("match", "date"):
-                break
-            j += 1
-        
-        players = []
-        player_of_match = ""
+        s = np.searchsorted(stats_rows, i, side="right")
+        if s < len(stats_rows) and stats_rows[s] < next_boundary:
+            stats_idx = int(stats_rows[s])
+
+        end = next_boundary
+        pom_idx = None
         if stats_idx is not None:
-            header_row = df.iloc[stats_idx]
-            col_map = {}
-            for col_idx in range(ncols):
-                h = header_row[col_idx]
-                if pd.isna(h):
-                    continue
-                hs = str(h).strip().lower()
-                if hs in ("#", "number", "num"):
-                    col_map["number"] = col_idx
-                elif "name" in hs or "names" in hs or "όνομα" in hs:
-                    if "name" not in col_map:
-                        col_map["name"] = col_idx
-                elif "play" in hs:
-                    col_map["played"] = col_idx
-                elif "goal" in hs:
-                    if "goals" not in col_map:
-                        col_map["goals"] = col_idx
-                elif "assist" in hs:
+            p = np.searchsorted(pom_rows, stats_idx, side="right")
+            if p < len(pom_rows) and pom_rows[p] < next_boundary:
+                pom_idx = int(pom_rows[p])
+                end = pom_idx
+
+        blocks.append({
+            "match": i,
+            "date_rows": dates_above,
+            "stats": stats_idx,
+            "end": end,
+            "pom": pom_idx
+        })
+    return blocks
+
+def parse_match_block(df, block, score_index=None):
+    """Parse one match block as located by segment_blocks"""
+    import pandas as pd
+    nrows, ncols = df.shape
+    if score_index is None:
+        score_index = build_score_index(df)
+    i = block["match"]
+    row = df.iloc[i]
+    opponent = ""
+    outcome = None
+    match_date = None
+    location = "Home"  # Default to home
+
+    # Get date AND location from the Date row above
+    match_date, drow, dcol, location = find_date_row_above(df, block["date_rows"])
+
+    if match_date is None:
+        for c in range(ncols):
+            if isinstance(df.iat[i, c], (pd.Timestamp, datetime)):
+                match_date = df.iat[i, c]
+                break
+    if match_date is None:
+        match_date, drow, dcol = find_nearest_date_above(df, i, max_lookback=10)
+
+    # Find opponent in the Match row
+    for c in range(ncols):
+        cell = row[c]
+        if pd.isna(cell):
+            continue
+        s = str(cell).strip()
+        if s.upper() in ("W","L","D"):
+            outcome = s.upper()
+        if "vs" in s.lower():
+            idx = s.lower().find("vs")
+            opponent_candidate = s[idx+2:].strip()
+            opponent = opponent_candidate.strip(" :.-")
+
+    # find explicit score nearby
+    result, score_row, score_col = find_score_near(score_index, nrows, i, max_up=8, max_down=3)
+
+    # # Adjust score order based on home/away
+    # if result and location == "Away":
+    #     # For away matches, swap the score to show opponent first
+    #     home_goals, away_goals = result.split('-')
+    #     result = f"{home_goals}-{away_goals}"
+
+    # parse player block
+    stats_idx = block["stats"]
+
+    players = []
+    player_of_match = ""
+    if stats_idx is not None:
+        header_row = df.iloc[stats_idx]
+        col_map = {}
+        for col_idx in range(ncols):
+            h = header_row[col_idx]
+            if pd.isna(h):
+                continue
+            hs = str(h).strip().lower()
+            if hs in ("#", "number", "num"):
+                col_map["number"] = col_idx
+            elif "name" in hs or "names" in hs or "όνομα" in hs:
+                if "name" not in col_map:
+                    col_map["name"] = col_idx
+            elif "play" in hs:
+                col_map["played"] = col_idx
+            elif "goal" in hs:
+                if "goals" not in col_map:
+                    col_map["goals"] = col_idx
+            elif "assist" in hs:
+                if "assists" not in col_map:
                     col_map["assists"] = col_idx
-                elif "pom" in hs or "player of the match" in hs:
-                    col_map["pom"] = col_idx
-            
-            k = stats_idx + 1
-            while k < nrows:
-                r0 = df.iat[k, 0]
-                r0s = str(r0).strip() if not pd.isna(r0) else ""
-                if r0s.lower().startswith("player of the match"):
-                    pom_name = ""
-                    for c in range(ncols):
-                        cell = df.iat[k, c]
-                        if pd.isna(cell):
-                            continue
-                        s = str(cell).strip()
-                        if "player of the match" in s.lower():
-                            continue
-                        if s:
-                            pom_name = s
-                            break
-                    player_of_match = pom_name
-                    break
-                if r0s.lower() in ("match", "date"):
-                    break
-                
-                name_val = None
-                if "name" in col_map:
-                    name_val = df.iat[k, col_map["name"]]
-                else:
-                    for c in range(1, ncols):
-                        v = df.iat[k, c]
-                        if not pd.isna(v) and isinstance(v, str) and v.strip():
-                            name_val = v
-                            break
-                
-                number = 0
-                if "number" in col_map:
-                    numcell = df.iat[k, col_map["number"]]
-                    if not pd.isna(numcell):
-                        if isinstance(numcell, (int, float)):
-                            number = int(numcell)
-                        else:
-                            number = int(float(str(numcell)))
-                
-                if (pd.isna(name_val) or str(name_val).strip() == "") and number == 0:
-                    k += 1
+            elif "pom" in hs or "player of the match" in hs:
+                col_map["pom"] = col_idx
+
+        if block["pom"] is not None:
+            pom_name = ""
+            for c in range(ncols):
+                cell = df.iat[block["pom"], c]
+                if pd.isna(cell):
                     continue
-                
-                name = str(name_val).strip() if not pd.isna(name_val) else ""
-                position = ""
-                if "played" in col_map:
-                    pc = df.iat[k, col_map["played"]]
-                    if not pd.isna(pc):
-                        position = str(pc).strip()
-                        # Convert numeric positions to empty string (they didn't play)
-                        if position.replace('.', '').isdigit():
-                            if float(position) == 0:
-                                position = ""
-                            else:
-                                position = "Played" 
-                
-                if not position:
-                    k += 1
-                    continue  # fallback for non-zero numbers
-                
-                goals = 0
-                if "goals" in col_map:
-                    gc = df.iat[k, col_map["goals"]]
-                    if not pd.isna(gc):
-                        if isinstance(gc, (int, float)):
-                            goals = int(gc)
-                        else:
-                            goals = int(float(str(gc)))
-                
-                assists = 0
-                if "assists" in col_map:
-                    ac = df.iat[k, col_map["assists"]]
-                    if not pd.isna(ac):
-                        if isinstance(ac, (int, float)):
-                            assists = int(ac)
+                s = str(cell).strip()
+                if "player of the match" in s.lower():
+                    continue
+                if s:
+                    pom_name = s
+                    break
+            player_of_match = pom_name
+
+        for k in range(stats_idx + 1, block["end"]):
+            name_val = None
+            if "name" in col_map:
+                name_val = df.iat[k, col_map["name"]]
+            else:
+                for c in range(1, ncols):
+                    v = df.iat[k, c]
+                    if not pd.isna(v) and isinstance(v, str) and v.strip():
+                        name_val = v
+                        break
+
+            number = 0
+            if "number" in col_map:
+                numcell = df.iat[k, col_map["number"]]
+                if not pd.isna(numcell):
+                    if isinstance(numcell, (int, float)):
+                        number = int(numcell)
+                    else:
+                        number = int(float(str(numcell)))
+
+            if (pd.isna(name_val) or str(name_val).strip() == "") and number == 0:
+                continue
+
+            name = str(name_val).strip() if not pd.isna(name_val) else ""
+            position = ""
+            if "played" in col_map:
+                pc = df.iat[k, col_map["played"]]
+                if not pd.isna(pc):
+                    position = str(pc).strip()
+                    # Convert numeric positions to empty string (they didn't play)
+                    if position.replace('.', '').isdigit():
+                        if float(position) == 0:
+                            position = ""
                         else:
-                            assists = int(float(str(ac)))
-                
-                players.append({
-                    "number": number,
-                    "name": name,
-                    "position": position,
-                    "goals": int(goals),
-                    "assists": int(assists)
-                })
-                k += 1
-        
-        # if no explicit result, compute team goals and mark opponent as unknown
-        team_goals = sum(p["goals"] for p in players)
-        if not result:
-            result = f"{team_goals}-?"
-        
-        # parse gf/ga if possible
-        m = re.search(r"(\d+)\s*[-–]\s*(\d+|\?)", result)
-        gf = int(m.group(1)) if m else None
-        ga = None if (not m or m.group(2) == "?") else int(m.group(2))
-        
-        if outcome is None and gf is not None and ga is not None:
-            if gf > ga: outcome = "W"
-            elif gf == ga: outcome = "D"
-            else: outcome = "L"
-        
-        points = 0
-        if outcome == "W": points = 3
-        elif outcome == "D": points = 1
-        
-        date_str = ""
-        if match_date is not None:
-            date_str = pd.to_datetime(match_date).strftime("%Y-%m-%d")
-        
-        match = {
-            "date": date_str,
-            "opponent": opponent,
-            "location": location,
-            "result": result if result else "",
-            "outcome": outcome if outcome else "",
-            "points": points,
-            "player_of_match": player_of_match if player_of_match else "",
-            "players": players
-        }
-        print("Parsed:", match["date"], match["location"], match["opponent"], match["result"], "outcome:", match["outcome"], "players:", len(players), "POM:", match["player_of_match"])
-        matches.append(match)
+                            position = "Played"
+
+            if not position:
+                continue  # fallback for non-zero numbers
+
+            goals = 0
+            if "goals" in col_map:
+                gc = df.iat[k, col_map["goals"]]
+                if not pd.isna(gc):
+                    if isinstance(gc, (int, float)):
+                        goals = int(gc)
+                    else:
+                        goals = int(float(str(gc)))
 
-# summary
-played = len(matches)
-wins = sum(1 for m in matches if m["outcome"] == "W")
-draws = sum(1 for m in matches if m["outcome"] == "D")
-losses = sum(1 for m in matches if m["outcome"] == "L")
-points = sum(m["points"] for m in matches)
+            assists = 0
+            if "assists" in col_map:
+                ac = df.iat[k, col_map["assists"]]
+                if not pd.isna(ac):
+                    if isinstance(ac, (int, float)):
+                        assists = int(ac)
+                    else:
+                        assists = int(float(str(ac)))
+
+            players.append({
+                "number": number,
+                "name": name,
+                "position": position,
+                "goals": int(goals),
+                "assists": int(assists)
+            })
+
+    # if no explicit result, compute team goals and mark opponent as unknown
+    team_goals = sum(p["goals"] for p in players)
+    if not result:
+        result = f"{team_goals}-?"
+
+    # parse gf/ga if possible
+    m = re.search(r"(\d+)\s*[-–]\s*(\d+|\?)", result)
+    gf = int(m.group(1)) if m else None
+    ga = None if (not m or m.group(2) == "?") else int(m.group(2))
+
+    if outcome is None and gf is not None and ga is not None:
+        if gf > ga: outcome = "W"
+        elif gf == ga: outcome = "D"
+        else: outcome = "L"
+
+    points = 0
+    if outcome == "W": points = 3
+    elif outcome == "D": points = 1
+
+    date_str = ""
+    if match_date is not None:
+        date_str = pd.to_datetime(match_date).strftime("%Y-%m-%d")
+
+    return {
+        "date": date_str,
+        "opponent": opponent,
+        "location": location,
+        "result": result if result else "",
+        "outcome": outcome if outcome else "",
+        "points": points,
+        "player_of_match": player_of_match if player_of_match else "",
+        "players": players
+    }
+
+def log_parsed(match):
+    # DEBUG only: formatted lazily, so normal runs pay nothing per match
+    log.debug("Parsed: %s %s %s %s outcome: %s players: %d POM: %s", match["date"], match["location"], match["opponent"], match["result"], match["outcome"], len(match["players"]), match["player_of_match"])
+
+def parse_matches(df):
+    """Parse every match block of a header=None 'Φύλλο2' DataFrame"""
+    matches = []
+    with stage("segmentation"):
+        score_index = build_score_index(df)
+        blocks = segment_blocks(df)
+    with stage("extraction"):
+        for block in blocks:
+            match = parse_match_block(df, block, score_index)
+            log_parsed(match)
+            matches.append(match)
+    return matches
+
+def iter_sheet_rows(excel_path=EXCEL_PATH, sheet_name=SHEET_NAME):
+    """
+    Stream the cell values of a sheet row by row (openpyxl read-only mode).
+    Integral floats become ints, as pandas.read_excel does.
+    """
+    from openpyxl import load_workbook
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        for row in wb[sheet_name].iter_rows(values_only=True):
+            yield [int(v) if isinstance(v, float) and v.is_integer() else v for v in row]
+    finally:
+        wb.close()
+
+def _row_marker(row):
+    """Same normalisation as marker_column, for a single streamed row"""
+    if not row or row[0] is None or row[0] != row[0]:
+        return ""
+    return str(row[0]).strip().lower()
+
+def _parse_window(buffer, match_rows, lookback):
+    """Parse the blocks whose Match rows are `match_rows` from the buffered rows around them"""
+    import pandas as pd
+    window = [(idx, row) for idx, row in buffer if idx >= match_rows[0] - lookback]
+    offset = window[0][0]
+    width = max(len(row) for _, row in window)
+    df = pd.DataFrame([row + [None] * (width - len(row)) for _, row in window], dtype=object)
+    blocks = {b["match"]: b for b in segment_blocks(df, lookback)}
+    score_index = build_score_index(df)
+    return [parse_match_block(df, blocks[m - offset], score_index) for m in match_rows]
+
+def stream_matches(rows, lookback=10, max_down=3, flush_rows=256):
+    """
+    Yield parsed matches from an iterable of sheet rows (lists of cell values).
+
+    Only a bounded buffer is kept: `lookback` rows above the oldest open block
+    plus the rows since. A block is ready once it closes (next Date/Match
+    row, or its Player of the Match row) and the score window `max_down` rows
+    below its Match row has been read. Ready blocks are parsed together once
+    about `flush_rows` rows are buffered (flush_rows=0 yields each block
+    immediately). Output is identical to parse_matches on the whole sheet.
+    """
+    buffer = deque()
+    pending = []  # open blocks, oldest first
+    ready = []  # Match rows of closed blocks not parsed yet
+    for idx, row in enumerate(rows):
+        buffer.append((idx, row))
+        marker = _row_marker(row)
+
+        for block in pending:
+            if block["closed"]:
+                continue
+            if marker in ("date", "match"):
+                block["closed"] = True
+            elif marker == "stats":
+                block["stats"] = True
+            elif block["stats"] and marker.startswith("player of the match"):
+                block["closed"] = True
+
+        while pending and pending[0]["closed"] and idx >= pending[0]["match"] + max_down:
+            ready.append(pending.pop(0)["match"])
+
+        if ready and len(buffer) >= flush_rows:
+            yield from _parse_window(buffer, ready, lookback)
+            ready = []
+
+        if marker == "match":
+            pending.append({"match": idx, "stats": False, "closed": False})
+
+        # rows older than any unparsed block's lookback (or the next one's) are no longer needed
+        oldest = ready[0] if ready else pending[0]["match"] if pending else idx + 1
+        while buffer and buffer[0][0] < oldest - lookback:
+            buffer.popleft()
+
+    ready += [block["match"] for block in pending]
+    if ready:
+        yield from _parse_window(buffer, ready, lookback)
+
+def iter_matches(excel_path=EXCEL_PATH, sheet_name=SHEET_NAME):
+    """Stream matches straight from the workbook without loading the sheet into a DataFrame"""
+    for match in stream_matches(iter_sheet_rows(excel_path, sheet_name)):
+        log_parsed(match)
+        yield match
+
+def cache_path_for(output_json):
+    """Sidecar block cache next to the output, e.g. matches.json -> matches.cache.json"""
+    return os.path.splitext(output_json)[0] + ".cache.json"
+
+def load_block_cache(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        cache = json.load(f)
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("blocks", {})
+
+def save_block_cache(blocks, path):
+    json_writer.write_json(path, {"version": CACHE_VERSION, "blocks": blocks}, indent=None)
+
+def block_key(block):
+    """Blocks are keyed by their nearest Date row (the Match row if there is none)"""
+    rows = block["date_rows"]
+    return f"date:{rows[0]}" if rows else f"match:{block['match']}"
+
+def block_fingerprint(df, block, lookback=10, max_down=3):
+    """
+    Hash of every cell the block's parse can read: the date/score lookback
+    above the Match row down to the Player of the Match row (or block end).
+    """
+    import hashlib
+
+    nrows = df.shape[0]
+    i = block["match"]
+    last = block["pom"] if block["pom"] is not None else block["end"] - 1
+    start = max(i - lookback, 0)
+    stop = min(max(last, i + max_down) + 1, nrows)
+    cells = df.iloc[start:stop].to_numpy(dtype=object).tolist()
+    return hashlib.sha1(repr((start, cells)).encode("utf-8")).hexdigest()
+
+def parse_matches_incremental(df, cached_blocks):
+    """
+    Re-parse only match blocks whose fingerprint is new or changed.
+
+    `cached_blocks` is {block key: {"fingerprint", "match"}} from a previous
+    run. Returns (matches, blocks, reparsed) where `blocks` is the cache to
+    store for the next run and `reparsed` counts the blocks actually parsed.
+    """
+    matches = []
+    blocks = {}
+    reparsed = 0
+    score_index = None
+    for block in segment_blocks(df):
+        key = block_key(block)
+        fingerprint = block_fingerprint(df, block)
+        cached = cached_blocks.get(key)
+        if cached is not None and cached["fingerprint"] == fingerprint:
+            match = cached["match"]
+        else:
+            if score_index is None:
+                score_index = build_score_index(df)
+            match = parse_match_block(df, block, score_index)
+            reparsed += 1
+            log_parsed(match)
+        blocks[key] = {"fingerprint": fingerprint, "match": match}
+        matches.append(match)
+    return matches, blocks, reparsed
 
 def parse_score(s):
     if not s: return (0,0)
@@ -293,19 +533,18 @@ def parse_score(s):
         return (left, right)
     return (0,0)
 
-goals_for = sum(parse_score(m["result"])[0] for m in matches)
-goals_against = sum(parse_score(m["result"])[1] for m in matches)
-goal_diff = goals_for - goals_against
-win_pct = round((wins/played)*100,1) if played else 0.0
-
-data = {
-    "metadata": {
-        "last_updated": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
-        "total_matches": played,
-        "source_file": EXCEL_PATH,
-        "season": "2024-2025"
-    },
-    "summary": {
+def summarize_matches(matches):
+    """Season totals for the 'summary' block"""
+    played = len(matches)
+    wins = sum(1 for m in matches if m["outcome"] == "W")
+    draws = sum(1 for m in matches if m["outcome"] == "D")
+    losses = sum(1 for m in matches if m["outcome"] == "L")
+    points = sum(m["points"] for m in matches)
+    goals_for = sum(parse_score(m["result"])[0] for m in matches)
+    goals_against = sum(parse_score(m["result"])[1] for m in matches)
+    goal_diff = goals_for - goals_against
+    win_pct = round((wins/played)*100,1) if played else 0.0
+    return {
         "played": played,
         "wins": wins,
         "draws": draws,
@@ -315,11 +554,196 @@ data = {
         "goals_against": goals_against,
         "goal_difference": goal_diff,
         "win_percentage": win_pct
-    },
-    "matches": matches
-}
+    }
+
+def derive_match_stats(matches, form_length=FORM_LENGTH):
+    """
+    Build-time extras emitted next to 'summary': form over the latest
+    matches (newest first), home/away splits and POM awards per opponent
+    """
+    latest = sorted(matches, key=lambda m: m["date"], reverse=True)[:form_length]
+    pom_by_opponent = {}
+    for m in matches:
+        if m["player_of_match"]:
+            awards = pom_by_opponent.setdefault(m["opponent"], {})
+            awards[m["player_of_match"]] = awards.get(m["player_of_match"], 0) + 1
+    return {
+        "form": {
+            "matches": len(latest),
+            "outcomes": [m["outcome"] for m in latest],
+            "points": sum(m["points"] for m in latest)
+        },
+        "home": summarize_matches([m for m in matches if m["location"] == "Home"]),
+        "away": summarize_matches([m for m in matches if m["location"] == "Away"]),
+        "pom_by_opponent": pom_by_opponent
+    }
+
+def infer_season(matches):
+    """Season label from the earliest match date, seasons running August to July"""
+    dates = sorted(m["date"] for m in matches if m["date"])
+    if not dates:
+        return ""
+    year, month = int(dates[0][:4]), int(dates[0][5:7])
+    start = year if month >= 8 else year - 1
+    return f"{start}-{start + 1}"
+
+def build_matches_document(matches, source_file=EXCEL_PATH, season=None):
+    """
+    Wrap parsed matches with metadata, summary and derived stats, as written
+    to matches.json; without a season it is inferred from the match dates
+    """
+    if not season:
+        season = infer_season(matches)
+    with stage("aggregation"):
+        summary = summarize_matches(matches)
+        derived = derive_match_stats(matches)
+    return {
+        "metadata": {
+            "last_updated": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+            "total_matches": len(matches),
+            "source_file": source_file,
+            "season": season
+        },
+        "summary": summary,
+        "derived": derived,
+        "matches": matches
+    }
+
+def write_matches_json(data, output_json=OUTPUT_JSON):
+    if json_writer.write_json(output_json, data):
+        log.info("Wrote %s", output_json)
+    else:
+        log.info("%s already up to date", output_json)
+
+INDEX_FIELDS = ["date", "opponent", "location", "result", "outcome", "points", "player_of_match"]
+
+def match_id(match):
+    """Stable file name stem for a match: its date plus a short hash of the opponent"""
+    import hashlib
+    digest = hashlib.sha1(match["opponent"].encode("utf-8")).hexdigest()[:6]
+    return f"{match['date'] or 'undated'}-{digest}"
+
+def write_match_shards(data, shard_dir=SHARD_DIR):
+    """
+    Write the document as shard_dir/index.json (everything but the player
+    lines) plus one shard_dir/match-<match id>.json per match holding its
+    players; each index entry's "detail" is that file name. The detail files
+    are written before the index, so the index never lists a missing file.
+    match-*.json files of matches that are gone are removed.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    index_matches = []
+    ids = set()
+    details = {}
+    for match in data["matches"]:
+        mid = match_id(match)
+        while mid in ids:
+            mid += "-2"
+        ids.add(mid)
+        entry = {"id": mid}
+        entry.update({field: match[field] for field in INDEX_FIELDS})
+        entry["detail"] = f"{SHARD_PREFIX}{mid}.json"
+        index_matches.append(entry)
+        details[os.path.join(shard_dir, entry["detail"])] = {"id": mid, "players": match["players"]}
+    index = {key: value for key, value in data.items() if key != "matches"}
+    index["matches"] = index_matches
+    # unchanged detail files are left alone
+    json_writer.write_many(details)
+    json_writer.write_json(os.path.join(shard_dir, SHARD_INDEX), index)
+    current = {os.path.basename(path) for path in details}
+    for name in os.listdir(shard_dir):
+        if name.startswith(SHARD_PREFIX) and name.endswith(".json") and name not in current:
+            os.remove(os.path.join(shard_dir, name))
+    log.info("Wrote %s and %d match files", os.path.join(shard_dir, SHARD_INDEX), len(ids))
+
+def update_matches(excel_path=EXCEL_PATH, output_json=OUTPUT_JSON, sheet_name=SHEET_NAME, season=None, incremental=False, matches=None, streaming=False, db_path=None, shard_dir=None):
+    """
+    Parse one workbook and write its matches JSON; returns the document.
+    With incremental=True unchanged match blocks are taken from the sidecar
+    cache (see cache_path_for) instead of being parsed again; with
+    streaming=True the sheet is read row by row (iter_matches). An already
+    parsed `matches` list is written as is. The season defaults to the one
+    configured for the workbook in seasons.json (see partitions.py). With db_path the matches are
+    upserted into the history store and the JSON is exported from it. With
+    shard_dir a small index plus per-match detail files are written as well
+    (see write_match_shards); shard_dir must not be the directory of
+    output_json.
+    """
+    if shard_dir and os.path.abspath(shard_dir) == os.path.abspath(os.path.dirname(output_json) or "."):
+        raise ValueError(f"shard directory {shard_dir!r} must be its own subdirectory, not the output directory")
+    if matches is None and streaming:
+        matches = list(iter_matches(excel_path, sheet_name))
+    if matches is None:
+        df = load_sheets(excel_path, [sheet_name])[sheet_name]
+        if incremental:
+            cache_path = cache_path_for(output_json)
+            matches, blocks, reparsed = parse_matches_incremental(df, load_block_cache(cache_path))
+            log.info("Re-parsed %d of %d match blocks", reparsed, len(matches))
+            save_block_cache(blocks, cache_path)
+        else:
+            matches = parse_matches(df)
+    if season is None:
+        season = configured_season(excel_path) or infer_season(matches)
+    if db_path:
+        import history_store
+        conn = history_store.connect(db_path)
+        with stage('history_upsert'):
+            history_store.upsert_matches(conn, matches, season)
+        with stage('history_query'):
+            matches = history_store.season_matches(conn, season)
+        conn.close()
+    data = build_matches_document(matches, source_file=excel_path, season=season)
+    write_matches_json(data, output_json)
+    if shard_dir:
+        write_match_shards(data, shard_dir)
+    return data
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write matches JSON from the club workbook(s)")
+    parser.add_argument("workbooks", nargs="*", default=[EXCEL_PATH], help="workbook(s) to parse")
+    parser.add_argument("-o", "--output", default=OUTPUT_JSON, help="output file for a single workbook")
+    parser.add_argument("--output-dir", help="directory for per-workbook '<name>.matches.json' outputs")
+    parser.add_argument("--sheet", default=SHEET_NAME, help="match sheet name")
+    parser.add_argument("--season", help="season label (default: from seasons.json, else inferred from the match dates)")
+    parser.add_argument("-i", "--incremental", action="store_true", help="only re-parse match blocks that changed since the last run")
+    parser.add_argument("--stream", action="store_true", help="read the sheet row by row in constant memory (ignored with --incremental)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the workbook and output are unchanged")
+    parser.add_argument("--shards", nargs="?", const=SHARD_DIR, metavar="DIR", help=f"also write an index plus per-match detail files (default dir: {SHARD_DIR})")
+    parser.add_argument("--db", metavar="PATH", help="also store the matches in this history database (see history_store.py)")
+    add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_logging(args.verbose, args.quiet)
 
-with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+    batch = len(args.workbooks) > 1 or args.output_dir
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    for workbook in args.workbooks:
+        output = args.output
+        if batch:
+            stem = os.path.splitext(os.path.basename(workbook))[0]
+            output = os.path.join(args.output_dir or ".", f"{stem}.matches.json")
+        # skip workbooks whose inputs and output match the build manifest
+        default_step = output == OUTPUT_JSON and workbook == EXCEL_PATH and args.shards in (None, SHARD_DIR)
+        shard_dir = args.shards
+        if shard_dir and batch:
+            shard_dir = os.path.join(shard_dir, stem)
+        if shard_dir and os.path.abspath(shard_dir) == os.path.abspath(os.path.dirname(output) or "."):
+            parser.error(f"--shards {shard_dir} would mix the match files with the other outputs, use a subdirectory")
+        if default_step:
+            # same step, inputs and outputs as update_all, so neither invalidates the other
+            step, inputs, outputs = "matches", step_inputs("matches"), STEPS["matches"]["outputs"]
+            shard_dir = SHARD_DIR
+        else:
+            step = f"matches:{output}"
+            inputs = [workbook, "results_updater.py", "workbook_loader.py", "seasons.json", "partitions.py"]
+            outputs = [output] + ([os.path.join(shard_dir, SHARD_INDEX)] if shard_dir else [])
+        if not args.force and is_up_to_date(step, inputs, outputs):
+            log.info("Unchanged, skipping %s", output)
+            continue
+        update_matches(workbook, output, sheet_name=args.sheet, season=args.season, incremental=args.incremental, streaming=args.stream and not args.incremental, db_path=args.db, shard_dir=shard_dir)
+        record_step(step, inputs, outputs)
+    if args.profile:
+        write_profile(args.profile, command="results_updater")
 
-print("Wrote", OUTPUT_JSON)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Generate synthetic inputs shaped like the real ones, for benchmarking
+
+- a workbook with a 'Φύλλο2' sheet of Date/Match/Stats/"Player of the Match"
+  blocks (N matches x M players) and a matching 'Static Info' roster
+- a sheet.htm-style league table export with K teams
+
+Usage: python synthetic_data.py --matches 100 --players 22 --teams 12 --out-dir bench_data
+"""
+
+import argparse
+import os
+import random
+from datetime import datetime, timedelta
+
+from workbook_loader import MATCH_SHEET, STATIC_SHEET
+
+POSITIONS = ['Goalkeeper', 'Center Back', 'Full-Back', 'Center Mid', 'Winger', 'Striker']
+
+def player_names(n_players):
+    return [f"Player {i}" for i in range(n_players)]
+
+def match_sheet_rows(n_matches, n_players, seed=0):
+    """Rows of a 'Φύλλο2'-style sheet: one block per match"""
+    rng = random.Random(seed)
+    names = player_names(n_players)
+    start = datetime(2024, 9, 1)
+    rows = []
+    for m in range(n_matches):
+        goals_for = rng.randint(0, 6)
+        goals_against = rng.randint(0, 6)
+        outcome = 'W' if goals_for > goals_against else 'D' if goals_for == goals_against else 'L'
+        location = rng.choice(['Home', 'Away'])
+        rows.append(['Date', None, start + timedelta(days=7 * m), None, location])
+        rows.append(['Match', outcome, f"vs Opponent {m % 12}", None, f"{goals_for}-{goals_against}"])
+        rows.append(['Stats', '#', 'Names', 'Played', 'Goal', 'Assist'])
+        scorers = [rng.randrange(n_players) for _ in range(goals_for)]
+        for number, name in enumerate(names):
+            played = 1 if rng.random() < 0.6 else 0
+            goals = scorers.count(number) if played else 0
+            assists = rng.randint(0, 1) if played and rng.random() < 0.2 else 0
+            rows.append([None, number, name, played, goals, assists])
+        rows.append(['Player of the Match', None, rng.choice(names)])
+    return rows
+
+def static_info_rows(n_players, seed=0):
+    rng = random.Random(seed)
+    rows = [['Static Info', '#', 'Name', 'Age', 'Height', 'Position']]
+    for number, name in enumerate(player_names(n_players)):
+        rows.append([None, number, name, rng.randint(18, 40), rng.randint(165, 195), rng.choice(POSITIONS)])
+    return rows
+
+def write_workbook(path, n_matches, n_players=22, seed=0):
+    """Write a synthetic club workbook; returns the number of match sheet rows"""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    sheet = wb.create_sheet(MATCH_SHEET)
+    rows = match_sheet_rows(n_matches, n_players, seed)
+    for row in rows:
+        sheet.append(row)
+    static = wb.create_sheet(STATIC_SHEET)
+    for row in static_info_rows(n_players, seed):
+        static.append(row)
+    wb.save(path)
+    return len(rows)
+
+def league_html(n_teams, seed=0):
+    """An exported-sheet style HTML table: 6 header rows, then one row per team"""
+    rng = random.Random(seed)
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"></head><body><table><tbody>']
+    for r in range(6):
+        parts.append(f'<tr><th>{r}</th>' + '<td></td>' * 12 + '</tr>')
+    for position in range(1, n_teams + 1):
+        won, drawn, lost = rng.randint(0, 10), rng.randint(0, 5), rng.randint(0, 10)
+        scored, conceded = rng.randint(10, 80), rng.randint(10, 80)
+        cells = ['', position, f"TEAM {position}", won + drawn + lost, won, drawn, lost,
+                 scored, conceded, scored - conceded, 3 * won + drawn]
+        parts.append(f'<tr><th>{position + 6}</th>' +
+                     ''.join(f'<td class="s24">{cell}</td>' for cell in cells) + '</tr>')
+    parts.append('</tbody></table></body></html>')
+    return ''.join(parts)
+
+def write_league_html(path, n_teams, seed=0):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(league_html(n_teams, seed))
+    return n_teams
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic workbook and league table inputs")
+    parser.add_argument('--matches', type=int, default=30)
+    parser.add_argument('--players', type=int, default=22)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out-dir', default='bench_data')
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    workbook = os.path.join(args.out_dir, f"synthetic_{args.matches}x{args.players}.xlsx")
+    html = os.path.join(args.out_dir, f"synthetic_{args.teams}_teams.htm")
+    rows = write_workbook(workbook, args.matches, args.players, args.seed)
+    write_league_html(html, args.teams, args.seed)
+    print(f"Wrote {workbook} ({rows} rows) and {html}")
@@ -10,7 +10,16 @@ class TableLoader {
         try {
             console.log('Loading league data from JSON...');
             
-            const response = await fetch('league_data.json');
+            // The homepage bundle already carries the standings
+            const siteData = await loadSiteData();
+            if (siteData) {
+                this.leagueData = siteData.standings;
+                this.updateCompleteLeagueTable();
+                this.updateLastUpdated();
+                return this.leagueData;
+            }
+            
+            const response = await fetchData('league_data.json');
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
@@ -42,7 +51,8 @@ class TableLoader {
             const row = document.createElement('tr');
             
             // Highlight our team
-            if (team.team.includes('Μεγάλο Λειβάδι')) {
+            const ourTeamName = this.leagueData.our_team ? this.leagueData.our_team.team : 'Μεγάλο Λειβάδι';
+            if (team.team.includes(ourTeamName)) {
                 row.style.backgroundColor = '#fff3cd';
                 row.style.fontWeight = '600';
             } else {
@@ -71,7 +81,7 @@ class TableLoader {
 
     // Update team statistics
     updateTeamStats() {
-        const ourTeam = this.leagueData.teams.find(team => 
+        const ourTeam = this.leagueData.our_team || this.leagueData.teams.find(team => 
             team.team.includes('Μεγάλο Λειβάδι')
         );
         
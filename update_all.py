@@ -0,0 +1,184 @@
+"""
+Run the league table, player and match updaters as a small dependency graph,
+skipping any step whose inputs are unchanged
+
+Usage: python update_all.py [--force] [--db history.sqlite3] [--publish] [--workers N] [-v | -q] [--profile timings.json]
+
+    parse ──┬── players ──┬── images
+            │             │
+            └── matches ──┼── site_data ── publish (with --publish)
+    league_table ─────────┘
+
+Steps whose dependencies are done run at the same time on a thread pool, so
+the sheet.htm scrape overlaps the workbook parse and the wall-clock time is
+close to that of the longest branch. A failing step only stops the steps that
+depend on it ('blocked'); the other branch still finishes. Each updater
+module is imported only when its step actually has to run, so a run where
+nothing changed finishes without loading pandas. The match sheet is parsed
+once and both players.json and matches.json are built from that result.
+"""
+
+import argparse
+import sys
+import time
+
+from build_manifest import STEPS, step_is_current, record_named_step
+from workbook_loader import EXCEL_PATH
+from instrumentation import get_logger, configure_logging, add_logging_arguments, write_profile
+
+log = get_logger('update_all')
+
+# step -> steps that must finish first; 'parse' and 'publish' are not manifest steps
+GRAPH = {
+    'parse': [],
+    'league_table': [],
+    'players': ['parse'],
+    'matches': ['parse'],
+    'images': ['players'],
+    'site_data': ['league_table', 'players', 'matches'],
+    'publish': ['site_data']
+}
+
+# Φύλλο2 is parsed at most once per run and shared by the players and matches steps
+_parsed = {}
+
+def parsed_matches():
+    if 'matches' not in _parsed:
+        from workbook_loader import load_sheets, MATCH_SHEET
+        from results_updater import parse_matches
+        _parsed['matches'] = parse_matches(load_sheets(EXCEL_PATH)[MATCH_SHEET])
+    return _parsed['matches']
+
+def run_parse(db_path=None):
+    parsed_matches()
+    return True
+
+def run_league_table(db_path=None):
+    from extract_table import extract_table_data
+    return extract_table_data(db_path=db_path)
+
+def run_players(db_path=None):
+    # player lines are stored with the matches step
+    from player_updater import update_player_json
+    return update_player_json(EXCEL_PATH, 'players.json', matches=parsed_matches())
+
+def run_matches(db_path=None):
+    from results_updater import update_matches, SHARD_DIR
+    update_matches(EXCEL_PATH, 'matches.json', matches=parsed_matches(), db_path=db_path, shard_dir=SHARD_DIR)
+    return True
+
+def run_images(db_path=None):
+    from image_assets import build_image_assets
+    build_image_assets()
+    return True
+
+def run_site_data(db_path=None):
+    from bundle import write_site_data
+    write_site_data()
+    return True
+
+def run_publish(db_path=None):
+    from publish import publish
+    publish()
+    return True
+
+RUNNERS = {
+    'parse': run_parse,
+    'league_table': run_league_table,
+    'players': run_players,
+    'matches': run_matches,
+    'images': run_images,
+    'site_data': run_site_data,
+    'publish': run_publish
+}
+
+def stale_steps(force=False):
+    """Manifest steps that have to run; a step is also stale when one it depends on is"""
+    stale = set()
+    for name in STEPS:
+        if force or not step_is_current(name) or any(dep in stale for dep in GRAPH[name]):
+            stale.add(name)
+    return stale
+
+def _run_node(name, db_path):
+    start = time.perf_counter()
+    try:
+        ok = bool(RUNNERS[name](db_path))
+    except Exception:
+        log.exception("Step %s failed", name)
+        ok = False
+    return ok, time.perf_counter() - start
+
+def run_graph(nodes, db_path=None, workers=None):
+    """
+    Run `nodes` (a subset of GRAPH) as soon as their dependencies are done;
+    dependencies outside `nodes` count as done. Returns {node: status}.
+    """
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    status = {}
+    pending = [name for name in GRAPH if name in nodes]
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers or len(pending) or 1) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = [dep for dep in GRAPH[name] if dep in nodes]
+                if any(status.get(dep) in ('failed', 'blocked') for dep in deps):
+                    status[name] = 'blocked'
+                    pending.remove(name)
+                elif all(dep in status for dep in deps):
+                    running[pool.submit(_run_node, name, db_path)] = name
+                    pending.remove(name)
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                ok, seconds = future.result()
+                # the manifest is only written from this thread
+                if ok and name in STEPS:
+                    try:
+                        record_named_step(name)
+                    except Exception:
+                        log.exception("Recording step %s in the manifest failed", name)
+                        ok = False
+                status[name] = 'updated' if ok else 'failed'
+                log.info("%s: %s in %.2fs", name, status[name], seconds)
+    return status
+
+def update_all(force=False, db_path=None, publish=False, workers=None):
+    """
+    Run every stale step; returns {step: 'skipped' | 'updated' | 'failed' | 'blocked'}.
+    With db_path the matches and league table are also upserted into the
+    history database; with publish the outputs are published afterwards.
+    """
+    stale = stale_steps(force)
+    nodes = set(stale)
+    if stale & {'players', 'matches'}:
+        nodes.add('parse')
+    if publish:
+        nodes.add('publish')
+
+    status = {name: 'skipped' for name in STEPS if name not in stale}
+    status.update(run_graph(nodes, db_path, workers))
+    return {name: status[name] for name in GRAPH if name in status}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every updater whose inputs changed")
+    parser.add_argument('--force', action='store_true', help="run every step even if nothing changed")
+    parser.add_argument('--db', metavar='PATH', help="also store matches and standings in this history database")
+    parser.add_argument('--publish', action='store_true', help="write minified, hashed and compressed copies to data/ (see publish.py)")
+    parser.add_argument('--workers', type=int, help="threads for independent steps (default: one per step)")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(args.verbose, args.quiet)
+    
+    start = time.perf_counter()
+    status = update_all(force=args.force, db_path=args.db, publish=args.publish, workers=args.workers)
+    log.info("Finished in %.2fs", time.perf_counter() - start)
+    for name, state in status.items():
+        print(f"{name}: {state}")
+    if args.profile:
+        write_profile(args.profile, command='update_all', steps=status)
+    if {'failed', 'blocked'} & set(status.values()):
+        sys.exit(1)
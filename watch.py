@@ -0,0 +1,198 @@
+"""
+Watch the workbook and sheet.htm and rebuild the site JSON when they change
+
+Usage: python watch.py [--debounce 0.3] [--poll-interval 0.25] [-v | -q]
+
+Runs until interrupted. pandas stays loaded and the parsed match blocks stay
+in memory between rebuilds, so a save of the workbook only re-parses the
+match blocks that changed (see results_updater.parse_matches_incremental).
+Only the outputs whose inputs changed are rebuilt, followed by the homepage
+bundle (site_data.json) and, when players.json changed, the image map. Uses inotify when the
+optional `inotify_simple` package is installed, otherwise polls file stats.
+"""
+
+import argparse
+import os
+import time
+
+from build_manifest import step_is_current, record_named_step
+from instrumentation import get_logger, configure_logging, add_logging_arguments
+from workbook_loader import EXCEL_PATH, MATCH_SHEET, load_sheets
+
+HTML_PATH = 'sheet.htm'
+
+log = get_logger('watch')
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+class PollingWatcher:
+    """Detect changes by comparing size/mtime every poll_interval seconds"""
+
+    def __init__(self, paths, poll_interval=0.25):
+        self.paths = list(paths)
+        self.poll_interval = poll_interval
+        self._signatures = {path: _signature(path) for path in self.paths}
+
+    def _poll(self):
+        changed = set()
+        for path in self.paths:
+            signature = _signature(path)
+            if signature != self._signatures[path]:
+                self._signatures[path] = signature
+                changed.add(path)
+        return changed
+
+    def wait_for_changes(self, debounce):
+        """Block until something changed and then stayed quiet for `debounce` seconds"""
+        changed = set()
+        while not changed:
+            time.sleep(self.poll_interval)
+            changed = self._poll()
+        quiet_since = time.monotonic()
+        while time.monotonic() - quiet_since < debounce:
+            time.sleep(min(self.poll_interval, debounce))
+            more = self._poll()
+            if more:
+                changed |= more
+                quiet_since = time.monotonic()
+        return changed
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    """Same interface as PollingWatcher, driven by inotify events on the parent directories"""
+
+    def __init__(self, paths):
+        from inotify_simple import INotify, flags
+        self.inotify = INotify()
+        self._names = {}
+        mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.DELETE
+        for path in paths:
+            directory = os.path.dirname(os.path.abspath(path))
+            wd = self.inotify.add_watch(directory, mask)
+            self._names[(wd, os.path.basename(path))] = path
+
+    def _read(self, timeout_ms):
+        return {self._names[(event.wd, event.name)]
+                for event in self.inotify.read(timeout=timeout_ms)
+                if (event.wd, event.name) in self._names}
+
+    def wait_for_changes(self, debounce):
+        changed = set()
+        while not changed:
+            changed = self._read(None)
+        while True:
+            more = self._read(int(debounce * 1000))
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self):
+        self.inotify.close()
+
+def make_watcher(paths, poll_interval=0.25):
+    try:
+        return InotifyWatcher(paths)
+    except (ImportError, OSError):
+        log.info("inotify not available, polling every %.2fs", poll_interval)
+        return PollingWatcher(paths, poll_interval)
+
+class SiteBuilder:
+    """Keeps the parsed state warm and rebuilds the outputs of changed inputs"""
+
+    def __init__(self):
+        # heavy imports once, for the life of the process
+        import pandas  # noqa: F401
+        from results_updater import parse_matches_incremental, update_matches, SHARD_DIR
+        from player_updater import update_player_json
+        from extract_table import extract_table_data
+        from bundle import write_site_data
+        from image_assets import build_image_assets
+        self._parse_matches_incremental = parse_matches_incremental
+        self._update_matches = update_matches
+        self._shard_dir = SHARD_DIR
+        self._update_player_json = update_player_json
+        self._extract_table_data = extract_table_data
+        self._write_site_data = write_site_data
+        self._build_image_assets = build_image_assets
+        self.block_cache = {}
+        self.matches = []
+
+    def rebuild_workbook(self):
+        """Returns whether players.json was rewritten"""
+        df = load_sheets(EXCEL_PATH)[MATCH_SHEET]
+        self.matches, self.block_cache, reparsed = self._parse_matches_incremental(df, self.block_cache)
+        log.info("Re-parsed %d of %d match blocks", reparsed, len(self.matches))
+        self._update_matches(EXCEL_PATH, 'matches.json', matches=self.matches, shard_dir=self._shard_dir)
+        record_named_step('matches')
+        if self._update_player_json(EXCEL_PATH, 'players.json', matches=self.matches):
+            record_named_step('players')
+            return True
+        return False
+
+    def rebuild_table(self):
+        if self._extract_table_data(HTML_PATH, 'league_data.json'):
+            record_named_step('league_table')
+
+    def rebuild_derived(self, players_changed):
+        """The homepage bundle and (for new players.json) the image map"""
+        if players_changed and not step_is_current('images'):
+            self._build_image_assets()
+            record_named_step('images')
+        self._write_site_data()
+        record_named_step('site_data')
+
+    def rebuild(self, changed):
+        start = time.perf_counter()
+        players_changed = False
+        rebuilt = False
+        if EXCEL_PATH in changed and os.path.exists(EXCEL_PATH):
+            players_changed = self.rebuild_workbook()
+            rebuilt = True
+        if HTML_PATH in changed and os.path.exists(HTML_PATH):
+            self.rebuild_table()
+            rebuilt = True
+        if rebuilt:
+            self.rebuild_derived(players_changed)
+        log.info("Rebuilt in %.0f ms", (time.perf_counter() - start) * 1000)
+
+def watch(debounce=0.3, poll_interval=0.25):
+    builder = SiteBuilder()
+
+    # bring stale outputs up to date first; the workbook is always parsed once
+    # so the block cache is warm for the first edit
+    initial = {EXCEL_PATH}
+    if not step_is_current('league_table'):
+        initial.add(HTML_PATH)
+    builder.rebuild(initial)
+
+    watcher = make_watcher([EXCEL_PATH, HTML_PATH], poll_interval)
+    log.info("Watching %s and %s (Ctrl+C to stop)", EXCEL_PATH, HTML_PATH)
+    try:
+        while True:
+            changed = watcher.wait_for_changes(debounce)
+            log.info("Changed: %s", ', '.join(sorted(changed)))
+            try:
+                builder.rebuild(changed)
+            except Exception:
+                # a half-saved workbook must not kill the daemon; the next save retries
+                log.exception("Rebuild failed")
+    except KeyboardInterrupt:
+        log.info("Stopped")
+    finally:
+        watcher.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the site JSON whenever the workbook or sheet.htm changes")
+    parser.add_argument('--debounce', type=float, default=0.3, help="seconds of quiet before rebuilding")
+    parser.add_argument('--poll-interval', type=float, default=0.25, help="stat interval when inotify is unavailable")
+    add_logging_arguments(parser, profile=False)
+    args = parser.parse_args()
+    configure_logging(args.verbose, args.quiet)
+    watch(args.debounce, args.poll_interval)
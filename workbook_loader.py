@@ -0,0 +1,50 @@
+"""
+Load the club workbook once and share its sheets between the updaters
+"""
+
+import os
+
+from instrumentation import stage
+
+EXCEL_PATH = "ΜΕΓΑ ΛΙΒΑΔΙ FC.xlsx"
+MATCH_SHEET = "Φύλλο2"
+STATIC_SHEET = "Static Info"
+SHEET_NAMES = [MATCH_SHEET, STATIC_SHEET]
+
+# (absolute path, size, mtime) -> {sheet name: DataFrame}
+_sheet_cache = {}
+
+def _file_key(file_path):
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+def load_sheets(file_path=EXCEL_PATH, sheet_names=None):
+    """
+    Read every needed sheet from a single open of the workbook.
+
+    Sheets are read with header=None so row/column indices match the layout in
+    Excel. The result is cached per file state, so any number of updaters in the
+    same process share one open of the workbook.
+    """
+    import pandas as pd
+
+    wanted = list(sheet_names) if sheet_names else list(SHEET_NAMES)
+    key = _file_key(file_path)
+    sheets = _sheet_cache.get(key)
+
+    if sheets is None or any(name not in sheets for name in wanted):
+        names = list(SHEET_NAMES)
+        names += [name for name in wanted if name not in names]
+        with stage('workbook_open'):
+            workbook = pd.ExcelFile(file_path, engine='openpyxl')
+        with stage('sheet_read'):
+            sheets = workbook.parse(sheet_name=names, header=None)
+        workbook.close()
+        _sheet_cache.clear()
+        _sheet_cache[key] = sheets
+
+    return {name: sheets[name] for name in wanted}
+
+def clear_cache():
+    """Forget any previously loaded workbook"""
+    _sheet_cache.clear()